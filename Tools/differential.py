@@ -0,0 +1,165 @@
+"""
+Differential check of the front ends and engines on randomly generated programs.
+
+For each seed, a random Lox program is generated and
+  - parsed with both parsers (`descent` and `stack`), whose statement trees must print identically, and
+  - run on every engine at every optimization level, whose output (including any error report) must match.
+Mismatching seeds are printed along with the differing results, and the exit status is 1 if there were any.
+
+Usage: python Tools/differential.py [--seeds N] [--start S] [--show SEED]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import error_handler
+from lexer import Lexer
+from parser import PARSERS, ParseError
+from optimizer import Optimizer, OPTIMIZATION_LEVELS
+from resolver import Resolver
+from interpreter import Interpreter, ENGINES
+
+BINARY_OPERATORS = ("+", "-", "*", "/", "<", "<=", ">", ">=", "==", "!=", "and", "or")
+GLOBALS = ("v0", "v1", "v2", "v3")
+FUNCTIONS = ("f0", "f1")
+
+
+class ProgramGenerator:
+    """Random programs over a few global variables and two-parameter functions, mostly on numbers."""
+
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+
+    def literal(self) -> str:
+        roll = self.random.random()
+        if roll < 0.6:
+            return self.random.choice(("0", "-0", "1", "2", "3", "0.5", "10", "-1", "7"))
+        if roll < 0.8:
+            return self.random.choice(('"s"', '""', '"ab"'))
+        return self.random.choice(("true", "false", "nil"))
+
+    def expression(self, names: tuple[str, ...], functions: tuple[str, ...] = FUNCTIONS, depth: int = 0) -> str:
+        roll = self.random.random()
+        if depth >= 4 or roll < 0.25:
+            return self.literal()
+        if roll < 0.45:
+            return self.random.choice(names)
+        if roll < 0.55:
+            return f"{self.random.choice(('-', '!'))}{self.expression(names, functions, depth + 1)}"
+        if roll < 0.65:
+            return f"({self.expression(names, functions, depth + 1)})"
+        if roll < 0.75 and functions:
+            arguments = ", ".join(self.expression(names, functions, depth + 1) for _ in range(2))
+            return f"{self.random.choice(functions)}({arguments})"
+        operator = self.random.choice(BINARY_OPERATORS)
+        return f"{self.expression(names, functions, depth + 1)} {operator} {self.expression(names, functions, depth + 1)}"
+
+    def statement(self, names: tuple[str, ...], depth: int = 0) -> str:
+        roll = self.random.random()
+        if depth >= 2 or roll < 0.4:
+            return f"print {self.expression(names)};"
+        if roll < 0.6:
+            return f"{self.random.choice(names)} = {self.expression(names)};"
+        if roll < 0.75:
+            branches = f"if ({self.expression(names)}) {self.statement(names, depth + 1)}"
+            if self.random.random() < 0.5:
+                branches += f" else {self.statement(names, depth + 1)}"
+            return branches
+        if roll < 0.9:
+            body = " ".join(self.statement(names, depth + 1) for _ in range(2))
+            return f"{{ var n = 0; while (n < 3) {{ n = n + 1; {body} if ({self.expression(names)}) break; }} }}"
+        return f"{{ var w = {self.expression(names)}; print w; }}"
+
+    def program(self) -> str:
+        lines = [f"var {name} = {self.literal()};" for name in GLOBALS]
+        for index, name in enumerate(FUNCTIONS):
+            # A function only calls those declared before it, so there is no unbounded recursion
+            callee = FUNCTIONS[index - 1] if index else None
+            body = f"return {self.expression(('a', 'b'), FUNCTIONS[:index])};"
+            if callee and self.random.random() < 0.5:
+                body = f"if (a == b) return {callee}(b, a); " + body
+            lines.append(f"fun {name}(a, b) {{ {body} }}")
+        lines += [self.statement(GLOBALS) for _ in range(self.random.randint(4, 10))]
+        return "\n".join(lines) + "\n"
+
+
+def parse(source: str, parser: str):
+    error_handler.had_error = False
+    tokens = Lexer(source).scan_tokens()
+    try:
+        return PARSERS[parser](tokens).parse()
+    except ParseError:
+        return None
+
+
+def run(source: str, engine: str, optimize: int) -> str:
+    """Everything the program prints, including error reports."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        error_handler.had_error = False
+        error_handler.had_runtime_error = False
+        statements = parse(source, "descent")
+        if statements is not None and not error_handler.had_error:
+            interpreter = Interpreter(engine)
+            resolver = Resolver(interpreter)
+            resolver.resolve(statements)
+            if not resolver.had_error:
+                optimized = Optimizer(interpreter, optimize).optimize(statements)
+                if optimized is not statements:
+                    Resolver(interpreter).resolve(optimized)
+                interpreter.interpret(optimized)
+    return output.getvalue()
+
+
+def check(seed: int) -> list[str]:
+    """Descriptions of every disagreement for the program generated from `seed`."""
+    source = ProgramGenerator(seed).program()
+    problems = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        trees = {name: parse(source, name) for name in PARSERS}
+    printed = {name: None if tree is None else [stmt.to_string() for stmt in tree] for name, tree in trees.items()}
+    if len({repr(tree) for tree in printed.values()}) > 1:
+        problems.append("parsers disagree")
+
+    results = {(engine, optimize): run(source, engine, optimize)
+               for engine in ENGINES for optimize in OPTIMIZATION_LEVELS}
+    expected = results["tree", 0]
+    for (engine, optimize), result in results.items():
+        if result != expected:
+            problems.append(f"{engine} -O{optimize} printed {result!r}, tree -O0 printed {expected!r}")
+    return problems
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare parsers and engines on random programs.")
+    arg_parser.add_argument("--seeds", type=int, default=200, help="number of programs to check (default: 200)")
+    arg_parser.add_argument("--start", type=int, default=0, help="first seed (default: 0)")
+    arg_parser.add_argument("--show", type=int, metavar="SEED", help="print the program for SEED and exit")
+    args = arg_parser.parse_args()
+
+    if args.show is not None:
+        print(ProgramGenerator(args.show).program(), end="")
+        return
+
+    failures = 0
+    for seed in range(args.start, args.start + args.seeds):
+        problems = check(seed)
+        if problems:
+            failures += 1
+            print(f"seed {seed}:")
+            for problem in problems:
+                print(f"  {problem}")
+    print(f"{args.seeds - failures}/{args.seeds} programs agree")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
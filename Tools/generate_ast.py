@@ -1,75 +1,157 @@
 import sys
 
 
-def define_ast(output_dir, base_name, types):
+def define_ast(output_dir, base_name, types, imports=(), class_names={}, labels={}, caches={}):
     path = output_dir + "/" + base_name.lower() + ".py"
     print(f"generated AST code at {path}")
     with open(path, "w") as outfile:
+        outfile.write("# Generated by Tools/generate_ast.py; edit the type list there instead of this file.\n")
         outfile.write("from __future__ import annotations\n")
         outfile.write("from abc import ABC, abstractmethod\n")
         outfile.write("from tokens import Token\n")
+        for line in imports:
+            outfile.write(f"{line}\n")
         outfile.write("\n\n")
         outfile.write(f"class {base_name}(ABC):\n")
-        # outfile.write("    @abstractmethod\n")
-        # outfile.write("    def __init__(self): pass")
+        # Node classes use __slots__, so the base must not add a __dict__ either
+        outfile.write("    __slots__ = ()\n")
+        outfile.write("\n")
 
-        # base (abstract) accept method
+        # base (abstract) accept and to_string methods
         outfile.write("    @abstractmethod\n")
         outfile.write("    def accept(self, visitor: Visitor): pass\n")
+        outfile.write("\n")
+        outfile.write("    @abstractmethod\n")
+        outfile.write("    def to_string(self) -> str: pass\n")
         outfile.write("\n\n")
 
-        # each other clas for each type we have
+        # each other class for each type we have
         for name, fields in types.items():
-            define_type(outfile, name, fields)
+            define_type(outfile, base_name, name, fields,
+                        class_names.get(name, name), labels.get(name, class_names.get(name, name)), caches.get(name))
 
         # each visitor abstract method
-        define_visitor(outfile, base_name, types)
+        define_visitor(outfile, base_name, types, class_names)
 
 
-def define_visitor(outfile, base_name, types):
+def define_visitor(outfile, base_name, types, class_names):
     outfile.write("class Visitor:\n")
+    methods = []
     for type_name in types.keys():
-        outfile.write("    @abstractmethod\n")
-        outfile.write(
-            f"    def visit{type_name}{base_name}(self, {base_name.lower()}: {type_name}): pass")
-        outfile.write("\n\n")
-    outfile.write("\n\n")
-
+        methods.append("    @abstractmethod\n"
+                       f"    def visit{type_name}{base_name}(self, {base_name.lower()}: {class_names.get(type_name, type_name)}): pass\n")
+    outfile.write("\n".join(methods))
+
+
+def parse_fields(fields):
+    # "left: Expr, operator: Token" -> [("left", "Expr"), ("operator", "Token")]
+    if not fields:
+        return []
+    params = []
+    for field in fields.split(','):
+        name, field_type = field.split(':')
+        params.append((name.strip(), field_type.strip()))
+    return params
+
+
+def parse_caches(caches):
+    # "version: int = -1, value: object = None" -> [("version", "int", "-1"), ("value", "object", "None")]
+    if not caches:
+        return []
+    params = []
+    for cache in caches.split(','):
+        declaration, default = cache.split('=')
+        name, cache_type = declaration.split(':')
+        params.append((name.strip(), cache_type.strip(), default.strip()))
+    return params
+
+
+def field_to_string(name, field_type):
+    # Expression placed inside the generated to_string f-string for one field
+    if field_type.startswith("list["):
+        return "[{', '.join(item.to_string() for item in self." + name + ")}]"
+    if field_type.endswith("| None"):
+        return "{None if not self." + name + " else self." + name + ".to_string()}"
+    if field_type == "object":
+        return "{self." + name + "}"
+    return "{self." + name + ".to_string()}"
+
+
+def define_type(outfile, base_name, name, fields, class_name, label, caches=None):
+    params = parse_fields(fields)
+    # Cache slots are interpreter state, not part of the tree: they start at their default and are not
+    # pickled or printed
+    cache_slots = parse_caches(caches)
+
+    outfile.write(f"class {class_name}({base_name}):\n")
+    names = [param for param, _ in params] + [cache for cache, _, _ in cache_slots]
+    slots = ", ".join(f'"{slot}"' for slot in names)
+    outfile.write(f"    __slots__ = ({slots}{',' if len(names) == 1 else ''})\n")
+    outfile.write("\n")
 
-def define_type(outfile, name, fields):
-    outfile.write(f"class {name}(Expr):\n")
     # init
-    outfile.write(f"    def __init__(self,{fields}):\n")
-    params = [field.strip() for field in fields.split(',')]
-    for param in params:
-        param = param.split(':')[0].strip()
-        outfile.write(f"        self.{param} = {param}\n")
+    if params:
+        signature = ", ".join(f"{param}: {field_type}" for param, field_type in params)
+        outfile.write(f"    def __init__(self, {signature}):\n")
+        for param, _ in params:
+            outfile.write(f"        self.{param} = {param}\n")
+        for cache, cache_type, default in cache_slots:
+            outfile.write(f"        self.{cache}: {cache_type} = {default}\n")
+        outfile.write("\n")
 
     # visitor pattern
-    outfile.write("\n")
     outfile.write("    def accept(self, visitor: Visitor):\n")
-    outfile.write(f"        return visitor.visit{name}{base_name}(self)")
-    outfile.write("\n\n")
+    outfile.write(f"        return visitor.visit{name}{base_name}(self)\n")
+    outfile.write("\n")
+
+    # Pickled as a constructor call (see ast_cache.py), which loads much faster than per-slot state
+    outfile.write("    def __reduce__(self):\n")
+    arguments = ", ".join(f"self.{param}" for param, _ in params)
+    outfile.write(f"        return ({class_name}, ({arguments}{',' if len(params) == 1 else ''}))\n")
+    outfile.write("\n")
 
+    outfile.write("    def to_string(self) -> str:\n")
+    body = ", ".join(field_to_string(param, field_type) for param, field_type in params)
+    outfile.write(f"        return f\"{label}({body})\"\n")
+    outfile.write("\n\n")
 
-args = sys.argv
-base_name = "Expr"
 
-if len(args) == 2:
+expr_types = {"Assign": "name: Token, value: Expr",
+              "Binary": "left: Expr, operator: Token, right: Expr",
+              "Call": "callee: Expr, paren: Token, arguments: list[Expr]",
+              "Grouping": "expression: Expr",
+              "Literal": "value: object",
+              "Logical": "left: Expr, operator: Token, right: Expr",
+              "Unary": "operator: Token, right: Expr",
+              "Variable": "name: Token"}
+
+# Inline caches used by the tree-walking interpreter (see `Interpreter.visitVariableExpr`/`visitCallExpr`):
+# the globals version at which the node was found to read a global (or LOCAL, with the local's scope distance
+# and slot), and for calls the callee last checked. Binary and Unary nodes count operations on numbers until
+# they are quickened (see quickening.py).
+expr_caches = {"Binary": "cache_hits: int = 0",
+               "Call": "cache_version: int = -1, cache_callee: object = None",
+               "Unary": "cache_hits: int = 0",
+               "Variable": "cache_version: int = -1, cache_depth: int = 0, cache_slot: int = 0"}
+
+stmt_types = {"Block": "statements: list[Stmt]",
+              "Expression": "expression: Expr",
+              "Function": "name: Token, params: list[Token], body: list[Stmt]",
+              "If": "condition: Expr, then_branch: Stmt, else_branch: Stmt | None",
+              "Print": "expression: Expr",
+              "Return": "keyword: Token, value: Expr | None",
+              "Var": "name: Token, initializer: Expr | None",
+              "While": "condition: Expr, body: Stmt | None",
+              "Break": "keyword: Token"}
+
+
+if __name__ == "__main__":
+    args = sys.argv
+    if len(args) != 2:
+        print("Usage: generate_ast <output_dir>")
+        sys.exit(64)
     output_dir = args[1]
-elif len(args) == 3:
-    base_name = args[1]
-    output_dir = args[2]
-else:
-    print("Usage: generate_ast -BASE_NAME <output_dir>")
-    sys.exit(64)
-
-
-expr_types = {"Binary": f"left: {base_name}, operator: Token, right: {base_name}",
-              "Grouping": f"expression: {base_name}",
-              "Literal": f"value: object",
-              "Unary": f"operator: Token, right: {base_name}"}
-
-stmt_types = {"Expression": "expression: Expr",
-              "Print": "expression: Expr"}
-define_ast(output_dir, base_name, stmt_types)
+
+    define_ast(output_dir, "Expr", expr_types, labels={"Variable": "VarExpr"}, caches=expr_caches)
+    define_ast(output_dir, "Stmt", stmt_types, imports=["from expr import Expr"],
+               class_names={"Expression": "ExpressionStmt"}, labels={"Expression": "ExprStmt", "Var": "VarDec"})
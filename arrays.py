@@ -0,0 +1,148 @@
+"""
+Native numeric arrays. A `LoxArray` stores its numbers in an `array('d')`, 8 bytes per element, and the bulk
+natives (`arraySum`, `arrayDot`, `arrayAdd`, ...) run over it in a single call instead of a Lox loop.
+
+    var a = array(3);          // [0, 0, 0]
+    arraySet(a, 1, 2.5);
+    arrayPush(a, 4);
+    print arraySum(a);         // 6.5
+
+Arrays are mutable and compared by identity. Every native is impure as far as `memoize` is concerned, since an
+array's contents can change between calls.
+"""
+from __future__ import annotations
+import operator
+from array import array
+from itertools import repeat
+from error_handler import NativeError
+from native import NativeFunction, format_number
+
+
+class LoxArray:
+    __slots__ = ("values",)
+
+    def __init__(self, values: array):
+        self.values = values
+
+    def __str__(self) -> str:
+        return "[" + ", ".join(format_number(value) for value in self.values) + "]"
+
+
+def check_array(value: object) -> array:
+    if not isinstance(value, LoxArray):
+        raise NativeError("Expected an array.")
+    return value.values
+
+
+def check_number(value: object) -> float:
+    if not isinstance(value, float):
+        raise NativeError("Array elements must be numbers.")
+    return value
+
+
+def check_whole(value: object, what: str) -> int:
+    if not isinstance(value, float) or not value.is_integer():
+        raise NativeError(f"{what} must be a whole number.")
+    return int(value)
+
+
+def check_index(values: array, index: object) -> int:
+    i = check_whole(index, "Array index")
+    if not 0 <= i < len(values):
+        raise NativeError(f"Array index {i} is out of range for length {len(values)}.")
+    return i
+
+
+def check_same_length(a: array, b: array) -> None:
+    if len(a) != len(b):
+        raise NativeError(f"Arrays have different lengths ({len(a)} and {len(b)}).")
+
+
+def new_array(size: object) -> LoxArray:
+    n = check_whole(size, "Array size")
+    if n < 0:
+        raise NativeError("Array size can't be negative.")
+    return LoxArray(array("d", bytes(8 * n)))
+
+
+def get_element(a: object, index: object) -> float:
+    values = check_array(a)
+    return values[check_index(values, index)]
+
+
+def set_element(a: object, index: object, value: object) -> float:
+    values = check_array(a)
+    values[check_index(values, index)] = check_number(value)
+    return value
+
+
+def length(a: object) -> float:
+    return float(len(check_array(a)))
+
+
+def push(a: object, value: object) -> LoxArray:
+    check_array(a).append(check_number(value))
+    return a
+
+
+def slice_array(a: object, start: object, end: object) -> LoxArray:
+    """A new array of the elements from `start` up to but not including `end`."""
+    values = check_array(a)
+    first = check_whole(start, "Slice start")
+    last = check_whole(end, "Slice end")
+    if not 0 <= first <= last <= len(values):
+        raise NativeError(f"Slice {first}..{last} is out of range for length {len(values)}.")
+    return LoxArray(values[first:last])
+
+
+def total(a: object) -> float:
+    return float(sum(check_array(a)))
+
+
+def minimum(a: object) -> float:
+    values = check_array(a)
+    if not values:
+        raise NativeError("Can't take the minimum of an empty array.")
+    return min(values)
+
+
+def maximum(a: object) -> float:
+    values = check_array(a)
+    if not values:
+        raise NativeError("Can't take the maximum of an empty array.")
+    return max(values)
+
+
+def dot(a: object, b: object) -> float:
+    left, right = check_array(a), check_array(b)
+    check_same_length(left, right)
+    return float(sum(map(operator.mul, left, right)))
+
+
+def add(a: object, b: object) -> LoxArray:
+    """A new array of the elementwise sums."""
+    left, right = check_array(a), check_array(b)
+    check_same_length(left, right)
+    return LoxArray(array("d", map(operator.add, left, right)))
+
+
+def scale(a: object, factor: object) -> LoxArray:
+    """A new array of the elements multiplied by `factor`."""
+    values = check_array(a)
+    return LoxArray(array("d", map(operator.mul, values, repeat(check_number(factor)))))
+
+
+NATIVES = (
+    NativeFunction("array", 1, new_array),
+    NativeFunction("arrayGet", 2, get_element),
+    NativeFunction("arraySet", 3, set_element),
+    NativeFunction("arrayLen", 1, length),
+    NativeFunction("arrayPush", 2, push),
+    NativeFunction("arraySlice", 3, slice_array),
+    NativeFunction("arraySum", 1, total),
+    NativeFunction("arrayMin", 1, minimum),
+    NativeFunction("arrayMax", 1, maximum),
+    NativeFunction("arrayDot", 2, dot),
+    NativeFunction("arrayAdd", 2, add),
+    NativeFunction("arrayScale", 2, scale),
+)
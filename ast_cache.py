@@ -0,0 +1,190 @@
+"""
+On-disk cache of parsed scripts, so repeat runs of an unchanged script skip the Lexer and Parser.
+
+Entries live in a `__loxcache__` directory next to the script, named
+`<script name>.<interpreter version>.<source hash>.pickle`. Only one entry is kept per script: storing a new
+one evicts the others, and `prune` removes entries whose script is gone or that were written by a
+different interpreter version.
+
+Loading an entry unpickles it, and unpickling can run arbitrary code, so the cache directory is a trust
+boundary: anyone able to write an entry there could run code as whoever runs the script. `load` only reads
+entries owned by the current user that no one else can write to, and `store` writes them that way.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+import stat
+import error_handler
+from stmt import Stmt
+
+CACHE_DIR_NAME = "__loxcache__"
+SUFFIX = ".pickle"
+
+# Modules that determine the shape of the parsed AST; a change to any of them invalidates every entry
+AST_MODULES = ("tokens.py", "tokenType.py", "lexer.py", "parser.py", "expr.py", "stmt.py")
+
+
+def _interpreter_version() -> str:
+    digest = hashlib.sha256()
+    root = os.path.dirname(os.path.abspath(__file__))
+    for module in AST_MODULES:
+        with open(os.path.join(root, module), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:12]
+
+
+INTERPRETER_VERSION = _interpreter_version()
+
+
+def source_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        # Read in chunks so streamed scripts are never held in memory whole
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def cache_dir(path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def entry_path(path: str, digest: str) -> str:
+    return os.path.join(cache_dir(path), f"{os.path.basename(path)}.{INTERPRETER_VERSION}.{digest}{SUFFIX}")
+
+
+def parse_entry_name(entry: str) -> tuple[str, str, str] | None:
+    # "<script name>.<version>.<digest>.pickle" -> (script name, version, digest); script names may contain dots
+    if not entry.endswith(SUFFIX):
+        return None
+    parts = entry[:-len(SUFFIX)].rsplit(".", 2)
+    if len(parts) != 3:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def is_trusted(file) -> bool:
+    """Whether the open entry `file` was written by the current user and can't have been changed by anyone else."""
+    if not hasattr(os, "getuid"):
+        # No POSIX owners or permission bits to check (Windows)
+        return True
+    # Checked on the open file, so the entry can't be swapped between the check and the load
+    status = os.fstat(file.fileno())
+    return status.st_uid == os.getuid() and not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def load(path: str, digest: str) -> list[Stmt] | None:
+    try:
+        with open(entry_path(path, digest), "rb") as file:
+            if not is_trusted(file):
+                return None
+            return pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+
+def store(path: str, digest: str, statements: list[Stmt]) -> bool:
+    """Write the parsed statements for `path`, evicting its older entries. Returns False if nothing was written."""
+    # Scripts with syntax errors are never cached, so their errors are reported on every run
+    if any(statement is None for statement in statements):
+        return False
+
+    target = entry_path(path, digest)
+    try:
+        data = pickle.dumps(statements, protocol=pickle.HIGHEST_PROTOCOL)
+    except RecursionError:
+        # Very deeply nested trees cannot be pickled; they are just parsed every time
+        return False
+
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Write to a temporary file first so a concurrent run never loads a partial entry
+        temporary = f"{target}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        # Writable by the owner only, whatever the umask, or `load` would refuse it
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, target)
+    except OSError:
+        return False
+
+    evict(path, keep=os.path.basename(target))
+    return True
+
+
+def evict(path: str, keep: str) -> None:
+    directory = cache_dir(path)
+    name = os.path.basename(path)
+    for entry in os.listdir(directory):
+        parsed = parse_entry_name(entry)
+        if parsed and parsed[0] == name and entry != keep:
+            _remove(os.path.join(directory, entry))
+
+
+def prune(directory: str) -> int:
+    """Remove entries in the cache directory `directory` whose script no longer exists or whose version is stale."""
+    removed = 0
+    scripts_dir = os.path.dirname(os.path.abspath(directory))
+    for entry in os.listdir(directory):
+        parsed = parse_entry_name(entry)
+        if parsed is None:
+            continue
+        name, version, _ = parsed
+        if version != INTERPRETER_VERSION or not os.path.exists(os.path.join(scripts_dir, name)):
+            removed += _remove(os.path.join(directory, entry))
+    return removed
+
+
+def precompile(root: str, lexer_class) -> tuple[int, int, int]:
+    """
+    Parse every `.lox` script under `root` and cache it, then prune the cache directories.
+    Returns the number of scripts cached, the number that failed to parse and the number of stale entries removed.
+    """
+    from parser import Parser, ParseError
+
+    cached = failed = 0
+    cache_dirs = []
+    for directory, subdirectories, files in os.walk(root):
+        if CACHE_DIR_NAME in subdirectories:
+            subdirectories.remove(CACHE_DIR_NAME)
+            cache_dirs.append(os.path.join(directory, CACHE_DIR_NAME))
+
+        for name in sorted(files):
+            if not name.endswith(".lox"):
+                continue
+            path = os.path.join(directory, name)
+            digest = source_digest(path)
+            if load(path, digest) is not None:
+                cached += 1
+                continue
+
+            error_handler.had_error = False
+            with open(path, "r") as file:
+                tokens = lexer_class(file.read()).scan_tokens()
+            try:
+                statements = Parser(tokens).parse()
+            except ParseError:
+                statements = [None]
+            except RecursionError:
+                # Nested too deeply for the recursive-descent parser; the other scripts are still cached
+                failed += 1
+                continue
+
+            if not error_handler.had_error and store(path, digest, statements):
+                cached += 1
+                if os.path.join(directory, CACHE_DIR_NAME) not in cache_dirs:
+                    cache_dirs.append(os.path.join(directory, CACHE_DIR_NAME))
+            else:
+                failed += 1
+
+    removed = sum(prune(directory) for directory in cache_dirs)
+    return cached, failed, removed
+
+
+def _remove(path: str) -> int:
+    try:
+        os.remove(path)
+        return 1
+    except OSError:
+        return 0
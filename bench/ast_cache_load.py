@@ -0,0 +1,47 @@
+"""
+Time to get a statement list for a large script by lexing and parsing versus loading its cache entry.
+
+Usage: python bench/ast_cache_load.py [units]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import common
+import ast_cache
+from lexer import Lexer
+from parser import Parser
+
+UNIT = "fun f{i}(a, b) {{ var c = a * {i} + b; if (c > 10) return c; return -c; }}\nprint f{i}(1, 2);\n"
+
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "script.lox")
+    try:
+        with open(path, "w") as file:
+            file.write("".join(UNIT.format(i=i) for i in range(units)))
+
+        start = time.perf_counter()
+        with open(path) as file:
+            statements = Parser(Lexer(file.read()).scan_tokens()).parse()
+        parse_time = time.perf_counter() - start
+
+        digest = ast_cache.source_digest(path)
+        ast_cache.store(path, digest, statements)
+
+        start = time.perf_counter()
+        cached = ast_cache.load(path, ast_cache.source_digest(path))
+        load_time = time.perf_counter() - start
+
+        assert cached is not None and len(cached) == len(statements)
+        print(f"lex + parse: {parse_time * 1000:8.1f} ms")
+        print(f"cache load:  {load_time * 1000:8.1f} ms  ({parse_time / load_time:.1f}x faster)")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Memory used by the AST of a large generated program, and time spent evaluating it.
+
+Usage: python bench/ast_memory.py [units]
+"""
+import sys
+import time
+import tracemalloc
+import common
+from lexer import RegexLexer
+from parser import Parser
+from interpreter import Interpreter
+
+UNIT = "var v{i} = ({i} + 1) * 2 - {i} / 4;\nif (v{i} > 3 and v{i} < 100000) v{i} = -v{i}; else v{i} = 0;\n"
+
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    source = "".join(UNIT.format(i=i) for i in range(units))
+    tokens = RegexLexer(source).scan_tokens()
+
+    tracemalloc.start()
+    statements = Parser(tokens).parse()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"AST for {len(statements)} statements: {current / (1024 * 1024):.2f} MB "
+          f"({current / len(statements):.0f} bytes per statement)")
+
+    interpreter = Interpreter()
+    statements = common.prepare(source, interpreter)
+    start = time.perf_counter()
+    interpreter.interpret(statements)
+    print(f"interpret: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
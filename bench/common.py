@@ -0,0 +1,43 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+The scripts are run directly (`python bench/<script>.py`), so the repo root is put on the path here.
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from lexer import Lexer
+from parser import Parser
+from resolver import Resolver
+from optimizer import Optimizer
+from interpreter import Interpreter
+
+
+def prepare(source: str, interpreter: Interpreter, optimize: int = 1):
+    """Lex, parse, optimize and resolve `source` for `interpreter`, returning the statement list."""
+    tokens = Lexer(source).scan_tokens()
+    statements = Optimizer(interpreter, optimize).optimize(Parser(tokens).parse())
+    Resolver(interpreter).resolve(statements)
+    return statements
+
+
+def time_run(source: str, repeat: int = 5, engine: str = "tree", optimize: int = 1,
+             interpreter_class: type[Interpreter] = Interpreter, setup: str = "") -> float:
+    """
+    Best wall-clock time in seconds of interpreting `source` (lexing, parsing and resolving excluded).
+    Scripts pass an `Interpreter` subclass as `interpreter_class` to time it with an optimization turned off.
+    `setup` is run untimed on the same interpreter first, so `source` can use the globals it defines.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        interpreter = interpreter_class(engine)
+        interpreter.interpret(prepare(setup, interpreter, optimize))
+        statements = prepare(source, interpreter, optimize)
+        start = time.perf_counter()
+        interpreter.interpret(statements)
+        best = min(best, time.perf_counter() - start)
+    return best
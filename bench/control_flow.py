@@ -0,0 +1,84 @@
+"""
+Throughput of function returns and loop breaks on the tree-walking and closure engines. The tree engine is
+also timed with `break` and `return` raising exceptions, as they did before completion signals.
+
+Usage: python bench/control_flow.py
+"""
+from common import time_run
+from interpreter import Interpreter
+
+
+class BreakSignal(Exception):
+    pass
+
+
+class ReturnSignal(Exception):
+    def __init__(self, value: object):
+        self.value = value
+
+
+class ExceptionInterpreter(Interpreter):
+    """The tree engine with `break` and `return` unwinding by exception instead of returning a completion."""
+
+    def execute_block(self, statements, environment):
+        previous_env = self.environment
+        try:
+            self.environment = environment
+            for stmt in statements:
+                self.execute(stmt)
+        finally:
+            self.environment = previous_env
+
+    def visitBreakStmt(self, stmt):
+        raise BreakSignal()
+
+    def visitReturnStmt(self, stmt):
+        raise ReturnSignal(self.evaluate(stmt.value) if stmt.value else None)
+
+    def visitWhileStmt(self, stmt):
+        try:
+            while self.is_truthy(self.evaluate(stmt.condition)):
+                self.execute(stmt.body)
+        except BreakSignal:
+            pass
+
+    def visitCallExpr(self, call):
+        try:
+            return super().visitCallExpr(call)
+        except ReturnSignal as signal:
+            return signal.value
+
+CALLS = 20000
+BREAKS = 20000
+
+CALL_RETURN = f"""
+fun identity(x) {{ return x; }}
+var i = 0;
+while (i < {CALLS}) {{
+    i = identity(i) + 1;
+}}
+"""
+
+# Each outer iteration enters an inner loop that breaks on its first pass
+BREAK_LOOP = f"""
+var i = 0;
+while (i < {BREAKS}) {{
+    while (true) {{
+        break;
+    }}
+    i = i + 1;
+}}
+"""
+
+
+def main():
+    for label, engine, interpreter_class in (("tree (exceptions)", "tree", ExceptionInterpreter),
+                                             ("tree", "tree", Interpreter),
+                                             ("closure", "closure", Interpreter)):
+        calls = time_run(CALL_RETURN, repeat=5, engine=engine, interpreter_class=interpreter_class)
+        breaks = time_run(BREAK_LOOP, repeat=5, engine=engine, interpreter_class=interpreter_class)
+        print(f"{label:18} call/return {CALLS / calls / 1000:7.1f}k/s   break {BREAKS / breaks / 1000:7.1f}k/s")
+
+
+if __name__ == "__main__":
+    main()
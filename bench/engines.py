@@ -0,0 +1,35 @@
+"""
+Side-by-side throughput of the execution engines on loop- and call-heavy programs.
+
+Usage: python bench/engines.py
+"""
+from common import time_run
+from interpreter import ENGINES
+
+PROGRAMS = {
+    "loop": """
+var total = 0;
+for (var i = 0; i < 100000; i = i + 1) {
+    if (i / 2 > 10) total = total + i; else total = total - 1;
+}
+""",
+    "calls": """
+fun fib(n) {
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}
+fib(18);
+""",
+}
+
+
+def main():
+    print(f"{'program':<8}" + "".join(f"{engine + ' (ms)':>14}" for engine in ENGINES) + f"{'speedup':>10}")
+    for name, source in PROGRAMS.items():
+        times = [time_run(source, repeat=3, engine=engine) for engine in ENGINES]
+        row = "".join(f"{elapsed * 1000:>14.1f}" for elapsed in times)
+        print(f"{name:<8}{row}{times[0] / min(times):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Memory and time cost of local scopes.
+
+Compares the bytes allocated per scope holding three locals for a name-keyed `Environment` against a
+slot-indexed `Frame`, then times a call-heavy Lox program.
+
+Usage: python bench/frames.py
+"""
+import tracemalloc
+from common import time_run
+from environment import Environment, Frame
+
+SCOPES = 10000
+
+CALLS = """
+fun add3(a, b, c) {
+    var total = a + b;
+    return total + c;
+}
+var i = 0;
+var sum = 0;
+while (i < 20000) {
+    sum = add3(sum, i, 1);
+    i = i + 1;
+}
+"""
+
+
+def bytes_per_scope(make) -> float:
+    tracemalloc.start()
+    scopes = [make() for _ in range(SCOPES)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del scopes
+    return current / SCOPES
+
+
+def make_environment() -> Environment:
+    environment = Environment(None)
+    environment.define("a", 1.0)
+    environment.define("b", 2.0)
+    environment.define("c", 3.0)
+    return environment
+
+
+def make_frame() -> Frame:
+    return Frame([1.0, 2.0, 3.0], None)
+
+
+def main():
+    print(f"Environment: {bytes_per_scope(make_environment):.0f} bytes per scope")
+    print(f"Frame:       {bytes_per_scope(make_frame):.0f} bytes per scope")
+    elapsed = time_run(CALLS, repeat=3)
+    print(f"20000 calls: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Variable reads and calls through global names, which the tree-walking interpreter serves from
+inline caches on the `Variable` and `Call` nodes.
+
+Each is also timed with the caches turned off, resolving every read and checking every call as before.
+
+Usage: python bench/inline_caches.py
+"""
+from common import time_run
+from error_handler import LoxRuntimeError
+from lox_callable import LoxCallable
+from interpreter import Interpreter
+
+
+class UncachedInterpreter(Interpreter):
+    """The tree engine without inline caches: reads go through the side table and calls are always checked."""
+
+    def visitVariableExpr(self, expr):
+        local = self.locals.get(expr)
+        if local is not None:
+            return self.environment.get_at(local[0], local[1])
+        return self.globals.get(expr.name)
+
+    def visitCallExpr(self, call):
+        callee = self.evaluate(call.callee)
+        if not isinstance(callee, LoxCallable):
+            raise LoxRuntimeError(call.paren, "Can only call functions or classes.")
+        args = [self.evaluate(arg) for arg in call.arguments]
+        if len(args) != callee.arity():
+            raise LoxRuntimeError(call.paren, f"Expected {callee.arity()} args but got {len(args)} args.")
+        return callee.call(self, args)
+
+GLOBAL_READS = """
+var scale = 3;
+var offset = 1;
+fun reads(n) {
+    var total = 0;
+    for (var i = 0; i < n; i = i + 1) total = total + scale * i + offset;
+    return total;
+}
+reads(20000);
+"""
+
+GLOBAL_CALLS = """
+fun inc(x) { return x + 1; }
+fun calls(n) {
+    var total = 0;
+    for (var i = 0; i < n; i = i + 1) total = inc(total);
+    return total;
+}
+calls(20000);
+"""
+
+
+def main():
+    for label, source in (("global reads", GLOBAL_READS), ("global calls", GLOBAL_CALLS)):
+        uncached = time_run(source, repeat=10, interpreter_class=UncachedInterpreter)
+        cached = time_run(source, repeat=10)
+        print(f"{label}: {uncached * 1000:.1f} ms uncached, {cached * 1000:.1f} ms cached")
+
+
+if __name__ == "__main__":
+    main()
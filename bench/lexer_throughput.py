@@ -0,0 +1,57 @@
+"""
+Lexer throughput in MB/s on a large generated script, for each scanning engine.
+Also checks that every engine produces the same token stream.
+
+Usage: python bench/lexer_throughput.py [size_mb]
+"""
+import sys
+import time
+import common
+from lexer import LEXERS
+
+UNIT = """// generated block {i}
+fun f{i}(a, b) {{
+    /* nested /* comment */ here */
+    var total = a * 2.5 + b - {i};
+    if (total >= 10 and total != 12) print "value: " + total;
+    return total / 3;
+}}
+var x{i} = f{i}({i}, 3.75);
+"""
+
+
+def generate(size_mb: float) -> str:
+    units = []
+    size = 0
+    i = 0
+    while size < size_mb * 1024 * 1024:
+        unit = UNIT.format(i=i)
+        units.append(unit)
+        size += len(unit)
+        i += 1
+    return "".join(units)
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    source = generate(size_mb)
+    megabytes = len(source.encode()) / (1024 * 1024)
+
+    streams = {}
+    for name, lexer_class in LEXERS.items():
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            tokens = lexer_class(source).scan_tokens()
+            best = min(best, time.perf_counter() - start)
+        streams[name] = [(token.TYPE, token.LEXEME, token.LITERAL, token.LINE) for token in tokens]
+        print(f"{name:<6} {len(tokens):>9} tokens  {best:7.3f} s  {megabytes / best:7.2f} MB/s")
+
+    reference = next(iter(streams.values()))
+    for name, stream in streams.items():
+        if stream != reference:
+            print(f"{name}: token stream differs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Looking up 50 string keys with a chain of `if`s, as scripts had to before maps, against `mapGet`.
+
+Usage: python bench/maps.py
+"""
+from common import time_run
+
+KEYS = 50
+
+CHAIN = """
+fun lookup(key) {
+%s
+    return nil;
+}
+for (var i = 0; i < 200; i = i + 1)
+    for (var k = 0; k < %d; k = k + 1) lookup("k" + k);
+""" % ("\n".join(f'    {"if" if i == 0 else "else if"} (key == "k{i}") return {i};' for i in range(KEYS)), KEYS)
+
+MAP = """
+var table = map();
+for (var k = 0; k < %d; k = k + 1) mapPut(table, "k" + k, k);
+fun lookup(key) { return mapGet(table, key); }
+for (var i = 0; i < 200; i = i + 1)
+    for (var k = 0; k < %d; k = k + 1) lookup("k" + k);
+""" % (KEYS, KEYS)
+
+
+def main():
+    for label, source in (("if chain", CHAIN), ("map", MAP)):
+        print(f"{label}: {time_run(source, repeat=5) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+A recursive function called with repeated arguments, plain and wrapped with the `memoize` native.
+
+Usage: python bench/memoize.py
+"""
+from common import time_run
+
+FIB = """
+fun fib(n) {
+    if (n < 2) return n;
+    return fib(n - 2) + fib(n - 1);
+}
+%s
+for (var i = 0; i < 20; i = i + 1) fib(20);
+"""
+
+
+def main():
+    for label, setup in (("plain", ""), ("memoized", "fib = memoize(fib, 64);")):
+        print(f"{label}: {time_run(FIB % setup, repeat=5) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
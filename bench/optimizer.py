@@ -0,0 +1,28 @@
+"""
+Run time of a loop full of constant expressions and dead branches, without (-O0) and with (-O1) the optimizer.
+
+Usage: python bench/optimizer.py
+"""
+from common import time_run
+from interpreter import ENGINES
+
+CONSTANTS = """
+var total = 0;
+for (var i = 0; i < 20000; i = i + 1) {
+    if (false) print "tracing";
+    total = total + (60 * 60 * 24) / (2 + 2) - -(1);
+    var label = "item" + " " + "count";
+}
+"""
+
+
+def main():
+    for engine in ENGINES:
+        unoptimized = time_run(CONSTANTS, repeat=3, engine=engine, optimize=0)
+        optimized = time_run(CONSTANTS, repeat=3, engine=engine, optimize=1)
+        print(f"{engine:8} -O0 {unoptimized * 1000:7.1f} ms   -O1 {optimized * 1000:7.1f} ms   "
+              f"({unoptimized / optimized:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
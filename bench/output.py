@@ -0,0 +1,45 @@
+"""
+Printing 200000 short lines to a file with each line written as it is printed, through buffers of a few
+sizes, and into an in-memory capture sink.
+
+Usage: python bench/output.py
+"""
+import sys
+import tempfile
+import time
+from common import prepare
+from interpreter import Interpreter
+from output import StdoutSink, BufferedSink, CaptureSink
+
+SOURCE = """
+for (var i = 0; i < 200000; i = i + 1) print i;
+"""
+
+
+def time_sink(make_sink, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        with tempfile.TemporaryFile("w") as file:
+            # Sinks without a stream write to sys.stdout, so point it at the file for the run
+            stdout, sys.stdout = sys.stdout, file
+            try:
+                interpreter = Interpreter("vm", output=make_sink())
+                statements = prepare(SOURCE, interpreter)
+                start = time.perf_counter()
+                interpreter.interpret(statements)
+                best = min(best, time.perf_counter() - start)
+            finally:
+                sys.stdout = stdout
+    return best
+
+
+def main():
+    sinks = [("line by line", StdoutSink)]
+    sinks += [(f"buffered {size}", lambda size=size: BufferedSink(size)) for size in (1024, 64 * 1024, 1024 * 1024)]
+    sinks.append(("capture", CaptureSink))
+    for label, make_sink in sinks:
+        print(f"{label:16} {time_sink(make_sink) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Numeric loops, whose arithmetic and comparison nodes the tree-walking interpreter quickens into float-only
+forms, and a loop whose `+` sees both numbers and strings so its node keeps switching back to the generic path.
+
+Each is also timed with quickening turned off, so every node stays on the generic path.
+
+Usage: python bench/quickening.py
+"""
+from common import time_run
+import interpreter
+
+ARITHMETIC = """
+fun arithmetic(n) {
+    var total = 0;
+    for (var i = 0; i < n; i = i + 1) total = total + i * 2 - i / 4 + -i;
+    return total;
+}
+arithmetic(20000);
+"""
+
+MIXED = """
+fun join(a, b) { return a + b; }
+fun mixed(n) {
+    var s = "";
+    for (var i = 0; i < n; i = i + 1) {
+        join(i, 1);
+        if (i < 10) s = join(s, "x");
+    }
+    return s;
+}
+mixed(20000);
+"""
+
+
+def main():
+    for label, source in (("arithmetic", ARITHMETIC), ("mixed types", MIXED)):
+        quicken_after = interpreter.QUICKEN_AFTER
+        # Nodes never reach an infinite threshold, so none are quickened
+        interpreter.QUICKEN_AFTER = float("inf")
+        try:
+            generic = time_run(source, repeat=10)
+        finally:
+            interpreter.QUICKEN_AFTER = quicken_after
+        quickened = time_run(source, repeat=10)
+        print(f"{label}: {generic * 1000:.1f} ms generic, {quickened * 1000:.1f} ms quickened")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Variable lookup cost versus scope nesting depth.
+
+A loop nested `depth` blocks deep reads a global and a local declared in the outermost block. Every block
+declares a variable, since blocks that declare nothing get no scope (see `Resolver.declares_variables`).
+Without resolution every global read walks the whole `enclosing` chain doing a dict probe per level;
+with the Resolver globals are read directly and locals are found by their precomputed distance,
+so the time per iteration should stay flat as the depth grows.
+
+Usage: python bench/scope_depth.py [iterations]
+"""
+import sys
+import time
+from common import time_run
+from environment import Environment
+from tokens import Token
+from tokenType import TokenType as T
+
+DEPTHS = [1, 4, 8, 16]
+
+
+def nested_program(depth: int, iterations: int) -> str:
+    inner = f"""
+var total = 0;
+var i = 0;
+while (i < {iterations}) {{
+    total = total + g + d0;
+    i = i + 1;
+}}
+"""
+    # The innermost block holds `total` and `i`; `d0` is `depth - 1` scopes out from it
+    blocks = "".join(f"{{\nvar d{level} = {level};\n" for level in range(depth))
+    return "var g = 1;\n" + blocks + inner + "}\n" * depth
+
+
+def unresolved_lookup(depth: int, iterations: int) -> float:
+    """Time `iterations` reads of a global through the name-walking `Environment.get` for comparison."""
+    environment = Environment()
+    environment.define("g", 1.0)
+    for _ in range(depth):
+        environment = Environment(environment)
+    name = Token(T.IDENTIFIER, "g", None, 1)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        environment.get(name)
+    return time.perf_counter() - start
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"{'depth':>6} {'resolved us/iter':>18} {'chain-walk get us/lookup':>26}")
+    for depth in DEPTHS:
+        elapsed = time_run(nested_program(depth, iterations), repeat=3)
+        walk = unresolved_lookup(depth, iterations)
+        print(f"{depth:>6} {elapsed / iterations * 1e6:>18.2f} {walk / iterations * 1e6:>26.2f}")
+
+
+if __name__ == "__main__":
+    main()
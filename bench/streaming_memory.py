@@ -0,0 +1,74 @@
+"""
+Peak memory of lexing and parsing a large script read whole versus streamed from the file.
+
+Usage: python bench/streaming_memory.py [size_mb]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import common
+from lexer import RegexLexer, StreamingLexer
+from parser import Parser
+
+UNIT = "var x{i} = {i} * 2 + 1;\nif (x{i} > 10) print \"large\"; else print x{i};\n"
+
+
+def write_script(path: str, size_mb: float) -> None:
+    with open(path, "w") as file:
+        written = 0
+        i = 0
+        while written < size_mb * 1024 * 1024:
+            written += file.write(UNIT.format(i=i))
+            i += 1
+
+
+def measure(label: str, run) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:<24} peak {peak / (1024 * 1024):8.1f} MB  {elapsed:6.2f} s")
+
+
+def whole_tokens(path):
+    with open(path) as file:
+        return len(RegexLexer(file.read()).scan_tokens())
+
+
+def streamed_tokens(path):
+    with open(path) as file:
+        return sum(1 for _ in StreamingLexer(file).stream_tokens())
+
+
+def whole_parse(path):
+    with open(path) as file:
+        return Parser(RegexLexer(file.read()).scan_tokens()).parse()
+
+
+def streamed_parse(path):
+    with open(path) as file:
+        return Parser(StreamingLexer(file).stream_tokens()).parse()
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    fd, path = tempfile.mkstemp(suffix=".lox")
+    os.close(fd)
+    try:
+        write_script(path, size_mb)
+        print(f"script: {os.path.getsize(path) / (1024 * 1024):.1f} MB")
+        measure("lex, whole file", lambda: whole_tokens(path))
+        measure("lex, streamed", lambda: streamed_tokens(path))
+        measure("lex+parse, whole file", lambda: whole_parse(path))
+        measure("lex+parse, streamed", lambda: streamed_parse(path))
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
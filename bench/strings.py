@@ -0,0 +1,39 @@
+"""
+Building a large string by appending 100-character lines, with `+` on an accumulator and with a string builder.
+`+` copies the accumulator on every append, so it is only run up to the smaller `--plus-megabytes` size.
+
+Usage: python bench/strings.py [--megabytes N] [--plus-megabytes N]
+"""
+import argparse
+from common import time_run
+
+LINE = "x" * 99 + ";"
+
+PLUS = """
+var out = "";
+for (var i = 0; i < %d; i = i + 1) out = out + "%s";
+"""
+
+BUILDER = """
+var out = builder();
+for (var i = 0; i < %d; i = i + 1) builderAppend(out, "%s");
+var text = builderString(out);
+"""
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--megabytes", type=float, default=10.0)
+    arg_parser.add_argument("--plus-megabytes", type=float, default=1.0)
+    args = arg_parser.parse_args()
+
+    for label, template, megabytes in (("+", PLUS, args.plus_megabytes),
+                                       ("builder", BUILDER, args.plus_megabytes),
+                                       ("builder", BUILDER, args.megabytes)):
+        lines = int(megabytes * 1_000_000) // len(LINE)
+        seconds = time_run(template % (lines, LINE), repeat=3)
+        print(f"{label:8} {megabytes:g} MB: {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
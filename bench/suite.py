@@ -0,0 +1,147 @@
+"""
+Benchmark suite: times the lexing, parsing, resolving and interpreting of each program in bench/programs
+(plus a large generated source) separately, over several runs.
+
+Reports the median and standard deviation per phase, can save the results as JSON, and can compare them
+against a JSON file saved earlier, exiting with status 1 if any phase got slower than the threshold.
+
+Usage: python bench/suite.py [--repeat N] [--engine E] [--lexer L] [--json FILE] [--baseline FILE]
+                             [--threshold PERCENT] [program ...]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from common import ROOT
+import error_handler
+from lexer import LEXERS
+from parser import Parser
+from resolver import Resolver
+from optimizer import Optimizer
+from interpreter import Interpreter, ENGINES
+
+PROGRAMS_DIR = os.path.join(ROOT, "bench", "programs")
+PHASES = ("lex", "parse", "resolve", "interpret")
+
+
+def generated_source(functions: int = 1500) -> str:
+    """A long script of many small declarations and statements, so lexing and parsing dominate."""
+    parts = []
+    for i in range(functions):
+        parts.append(f"fun f{i}(a, b) {{\n    var c = a * {i} + b;\n    if (c > {i}) {{ c = c - 1; }}\n    return c;\n}}\n")
+        parts.append(f"var v{i} = f{i}({i}, {i % 7});\nvar s{i} = \"name \" + v{i};\n")
+    return "".join(parts)
+
+
+def load_programs(names: list[str]) -> dict[str, str]:
+    programs = {}
+    for entry in sorted(os.listdir(PROGRAMS_DIR)):
+        if entry.endswith(".lox"):
+            with open(os.path.join(PROGRAMS_DIR, entry)) as file:
+                programs[entry[:-len(".lox")]] = file.read()
+    programs["generated"] = generated_source()
+    if names:
+        unknown = set(names) - programs.keys()
+        if unknown:
+            sys.exit(f"unknown programs: {', '.join(sorted(unknown))}")
+        programs = {name: source for name, source in programs.items() if name in names}
+    return programs
+
+
+def run_once(source: str, engine: str, lexer: str) -> dict[str, float]:
+    times = {}
+    error_handler.had_error = False
+    error_handler.had_runtime_error = False
+    interpreter = Interpreter(engine)
+
+    start = time.perf_counter()
+    tokens = LEXERS[lexer](source).scan_tokens()
+    times["lex"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    statements = Parser(tokens).parse()
+    times["parse"] = time.perf_counter() - start
+
+    # The optimizer pass is counted with the resolver; both run between parsing and interpreting
+    start = time.perf_counter()
+    statements = Optimizer(interpreter).optimize(statements)
+    Resolver(interpreter).resolve(statements)
+    times["resolve"] = time.perf_counter() - start
+
+    # Program output is discarded so printing to the terminal is not part of the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        interpreter.interpret(statements)
+        times["interpret"] = time.perf_counter() - start
+    return times
+
+
+def measure(source: str, repeat: int, engine: str, lexer: str) -> dict[str, dict[str, float]]:
+    runs = [run_once(source, engine, lexer) for _ in range(repeat)]
+    results = {}
+    for phase in PHASES:
+        samples = [run[phase] for run in runs]
+        results[phase] = {"median": statistics.median(samples),
+                          "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                          "min": min(samples)}
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Lines describing each phase that is more than `threshold` percent slower than in `baseline`."""
+    regressions = []
+    for name, phases in results.items():
+        for phase, stats in phases.items():
+            before = baseline.get(name, {}).get(phase)
+            if not before or before["median"] == 0:
+                continue
+            change = (stats["median"] / before["median"] - 1) * 100
+            if change > threshold:
+                regressions.append(f"{name} {phase}: {before['median'] * 1000:.2f} ms -> "
+                                   f"{stats['median'] * 1000:.2f} ms (+{change:.1f}%)")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Time each phase of running the bench/programs scripts.")
+    arg_parser.add_argument("programs", nargs="*", help="programs to run (default: all)")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--engine", choices=ENGINES, default="tree")
+    arg_parser.add_argument("--lexer", choices=LEXERS, default="char")
+    arg_parser.add_argument("--json", metavar="FILE", help="write the results to FILE")
+    arg_parser.add_argument("--baseline", metavar="FILE", help="compare against results saved with --json")
+    arg_parser.add_argument("--threshold", type=float, default=10.0,
+                            help="percent slowdown of a phase's median reported as a regression (default: 10)")
+    args = arg_parser.parse_args()
+
+    results = {}
+    print(f"{'program':14} " + " ".join(f"{phase + ' (ms)':>20}" for phase in PHASES))
+    for name, source in load_programs(args.programs).items():
+        results[name] = measure(source, args.repeat, args.engine, args.lexer)
+        cells = (f"{stats['median'] * 1000:10.2f} ±{stats['stdev'] * 1000:8.2f}"
+                 for stats in results[name].values())
+        print(f"{name:14} " + " ".join(cells))
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"engine": args.engine, "lexer": args.lexer, "repeat": args.repeat, "results": results},
+                      file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nSlower than {args.baseline} by more than {args.threshold:g}%:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo phase slower than {args.baseline} by more than {args.threshold:g}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Tail-recursive Lox functions: the deepest recursion each engine completes, and the time per tail call.
+
+Usage: python bench/tail_calls.py
+"""
+import contextlib
+import io
+from common import time_run
+import error_handler
+
+COUNTDOWN = """
+fun count(n, acc) {{
+    if (n == 0) return acc;
+    return count(n - 1, acc + 1);
+}}
+for (var i = 0; i < {rounds}; i = i + 1) count({depth}, 0);
+"""
+
+DEPTHS = (100, 1000, 100000)
+
+
+def main():
+    for engine in ("tree", "vm", "closure"):
+        for depth in DEPTHS:
+            error_handler.had_runtime_error = False
+            # Engines that recurse in Python report a stack overflow as a runtime error; its reports are dropped
+            with contextlib.redirect_stdout(io.StringIO()):
+                elapsed = time_run(COUNTDOWN.format(depth=depth, rounds=max(1, 20000 // depth)), repeat=3, engine=engine)
+            if error_handler.had_runtime_error:
+                print(f"{engine:8} depth {depth:>6}: stack overflow")
+                continue
+            calls = max(1, 20000 // depth) * depth
+            print(f"{engine:8} depth {depth:>6}: {elapsed / calls * 1e6:6.2f} us per call")
+
+
+if __name__ == "__main__":
+    main()
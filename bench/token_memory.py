@@ -0,0 +1,31 @@
+"""
+Memory held per token after lexing a generated script (token objects plus the lexeme strings they own).
+
+Usage: python bench/token_memory.py [units]
+"""
+import sys
+import tracemalloc
+import common
+from lexer import LEXERS
+
+UNIT = "fun area{i}(width, height) {{ var result = width * height; return result; }}\nprint area{i}(width, height);\n"
+
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    source = "".join(UNIT.format(i=i) for i in range(units))
+
+    for name, lexer_class in LEXERS.items():
+        tracemalloc.start()
+        tokens = lexer_class(source).scan_tokens()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        identifiers = [token.LEXEME for token in tokens if token.LEXEME == "width"]
+        distinct = len({id(lexeme) for lexeme in identifiers})
+        print(f"{name:<6} {len(tokens):>8} tokens  {current / len(tokens):6.1f} bytes/token  "
+              f"{distinct} distinct 'width' strings")
+        del tokens, identifiers
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Cost of the tracing hooks: the same program run with no tracer, with a tracer whose hooks do nothing and with an
+`EventRecorder`.
+
+Usage: python bench/tracing.py
+"""
+import time
+from common import prepare
+from interpreter import Interpreter
+from tracing import Tracer, EventRecorder
+
+class NoopTracer(Tracer):
+    # Overrides every hook so that all of them are installed
+    def node_enter(self, node): pass
+    def node_exit(self, node, value): pass
+    def scope_push(self, environment): pass
+    def scope_pop(self, environment): pass
+    def call_enter(self, callee, arguments, call): pass
+    def call_exit(self, callee, value, call): pass
+
+
+LOOP = """
+fun square(n) { return n * n; }
+var total = 0;
+for (var i = 0; i < 5000; i = i + 1) {
+    total = total + square(i);
+}
+"""
+
+
+def time_traced(make_tracer, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        interpreter = Interpreter()
+        statements = prepare(LOOP, interpreter)
+        tracer = make_tracer()
+        if tracer is not None:
+            interpreter.set_tracer(tracer)
+        start = time.perf_counter()
+        interpreter.interpret(statements)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    for label, make_tracer in (("no tracer", lambda: None), ("NoopTracer", NoopTracer), ("EventRecorder", EventRecorder)):
+        print(f"{label:14} {time_traced(make_tracer) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
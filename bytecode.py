@@ -0,0 +1,97 @@
+from __future__ import annotations
+from math import copysign
+from stmt import Function
+
+# Opcodes for the bytecode engine. Operands follow their opcode inline in `Chunk.code`.
+CONSTANT = 0          # const_idx              push constants[const_idx]
+POP = 1               #                        discard the top of the stack
+GET_LOCAL_0 = 2       # slot                   push a local of the innermost Frame
+SET_LOCAL_0 = 3       # slot                   store the top of the stack (kept) in the innermost Frame
+GET_LOCAL = 4         # depth slot             push a local `depth` Frames out
+SET_LOCAL = 5         # depth slot             store the top of the stack (kept) `depth` Frames out
+DEFINE_LOCAL = 6      # slot                   pop into the innermost Frame
+GET_GLOBAL = 7        # token_idx              push a global, named by a Token constant
+SET_GLOBAL = 8        # token_idx              store the top of the stack (kept) in an existing global
+DEFINE_GLOBAL = 9     # token_idx              pop into a (possibly new) global
+ADD = 10              # token_idx              binary operators; the Token is used for error reporting
+SUBTRACT = 11         # token_idx
+MULTIPLY = 12         # token_idx
+DIVIDE = 13           # token_idx
+GREATER = 14          # token_idx
+GREATER_EQUAL = 15    # token_idx
+LESS = 16             # token_idx
+LESS_EQUAL = 17       # token_idx
+EQUAL = 18            #
+NOT_EQUAL = 19        #
+NOT = 20              #
+NEGATE = 21           # token_idx
+JUMP = 22             # target                 absolute jump
+JUMP_IF_FALSE = 23    # target                 pop the condition, jump if it is falsey
+JUMP_IF_TRUE_OR_POP = 24   # target            `or`: keep a truthy left operand and jump, else pop it
+JUMP_IF_FALSE_OR_POP = 25  # target            `and`: keep a falsey left operand and jump, else pop it
+PUSH_SCOPE = 26       # size                   enter a block with `size` local slots
+POP_SCOPE = 27        #                        leave a block
+CALL = 28             # argc token_idx         call the callee below the `argc` arguments
+RETURN = 29           #                        pop the return value and leave the current function
+FUNCTION = 30         # const_idx              push a VMFunction for the FunctionProto constant
+PRINT = 31            #                        pop and print
+TAIL_CALL = 32        # argc token_idx         `return f(...)`: like CALL, but reuses the current call frame
+
+OPCODE_NAMES = {value: name for name, value in globals().items() if name.isupper() and isinstance(value, int)}
+
+# Number of inline operands following each opcode
+OPERAND_COUNTS = {
+    GET_LOCAL: 2, SET_LOCAL: 2, CALL: 2, TAIL_CALL: 2,
+    POP: 0, EQUAL: 0, NOT_EQUAL: 0, NOT: 0, POP_SCOPE: 0, RETURN: 0, PRINT: 0,
+}
+
+
+class Chunk:
+    """A compiled instruction sequence: a flat list of opcodes and operands plus its constant pool."""
+
+    def __init__(self):
+        self.code: list[int] = []
+        self.constants: list[object] = []
+        self._constant_index: dict[tuple, int] = {}
+
+    def emit(self, *code: int) -> int:
+        """Append an instruction and return the offset of its opcode."""
+        offset = len(self.code)
+        self.code.extend(code)
+        return offset
+
+    def add_constant(self, value: object) -> int:
+        # Numbers, strings, booleans and nil are shared. The type is part of the key since `True == 1.0` in Python,
+        # and a float's sign since `-0.0 == 0.0`.
+        if value is None or isinstance(value, (float, str, bool)):
+            key = (type(value), value, copysign(1.0, value)) if type(value) is float else (type(value), value)
+            if key not in self._constant_index:
+                self._constant_index[key] = len(self.constants)
+                self.constants.append(value)
+            return self._constant_index[key]
+
+        self.constants.append(value)
+        return len(self.constants) - 1
+
+    def disassemble(self) -> str:
+        lines = []
+        offset = 0
+        while offset < len(self.code):
+            op = self.code[offset]
+            count = OPERAND_COUNTS.get(op, 1)
+            operands = self.code[offset + 1:offset + 1 + count]
+            lines.append(f"{offset:04} {OPCODE_NAMES[op]:<22} {' '.join(str(operand) for operand in operands)}")
+            offset += 1 + count
+        return "\n".join(lines)
+
+
+class FunctionProto:
+    """The compiled form of a function declaration (or of a whole script, with `declaration` None)."""
+    __slots__ = ("name", "arity", "chunk", "frame_size", "declaration")
+
+    def __init__(self, name: str, arity: int, chunk: Chunk, frame_size: int, declaration: Function | None):
+        self.name = name
+        self.arity = arity
+        self.chunk = chunk
+        self.frame_size = frame_size
+        self.declaration = declaration
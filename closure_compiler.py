@@ -0,0 +1,407 @@
+from __future__ import annotations
+from typing import Callable
+from tokenType import TokenType as T
+from expr import Assign, Variable as VarExpr, Visitor as ExprVisitor, Expr, Literal, Unary, Binary, Grouping, Logical, Call
+from stmt import ExpressionStmt, Print, Var as VarStmt, Visitor as StmtVisitor, Stmt, Block, If, While, Break, Function, Return
+from tokens import Token
+from environment import Environment, Frame
+from error_handler import LoxRuntimeError, NativeError
+from completion import BREAK, RETURN, TAIL_CALL
+from lox_callable import LoxCallable
+
+# Every node compiles to a closure taking the current Environment/Frame.
+# Expression closures return the value; statement closures return their completion (see completion.py).
+Closure = Callable[[Environment | Frame], object]
+
+
+class ClosureFunction(LoxCallable):
+    """A Lox function whose body has been compiled to closures. Like `LoxFunction`, it only sees its parameters and the globals."""
+
+    def __init__(self, declaration: Function, body: Closure, frame_size: int, global_env: Environment):
+        self.declaration = declaration
+        self.body = body
+        self.frame_size = frame_size
+        self.global_env = global_env
+
+    def arity(self) -> int:
+        return len(self.declaration.params)
+
+    def call(self, interpreter, arguments: list[object]) -> object:
+        function = self
+        # Tail calls made by the body replace the running function here, as in LoxFunction.call
+        while True:
+            completion = function.body(Frame(arguments + [None] * (function.frame_size - len(arguments)),
+                                             function.global_env))
+            if completion is RETURN:
+                return interpreter.return_value
+            if completion is not TAIL_CALL:
+                return None
+            function, arguments = interpreter.tail_call
+
+    def to_string(self) -> str:
+        return f"<function {self.declaration.name.LEXEME}>"
+
+
+class ClosureCompiler(ExprVisitor, StmtVisitor):
+    """
+    Walks each `Stmt`/`Expr` once and produces a Python closure specialized for that node, e.g. a `Binary` `+`
+    becomes a closure that calls its two operand closures and adds. Operator dispatch and resolver lookups
+    happen at compile time, so running the program is just calling the root closure.
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def compile(self, statements: list[Stmt]) -> Callable[[], None]:
+        body = self.compile_block(statements)
+        global_env = self.interpreter.globals
+
+        def script():
+            body(global_env)
+        return script
+
+    def compile_stmt(self, stmt: Stmt) -> Closure:
+        return stmt.accept(self)
+
+    def compile_expr(self, expr: Expr) -> Closure:
+        return expr.accept(self)
+
+    def compile_block(self, statements: list[Stmt]) -> Closure:
+        compiled = [self.compile_stmt(statement) for statement in statements]
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def block(env):
+            for statement in compiled:
+                completion = statement(env)
+                if completion is not None:
+                    return completion
+            return None
+        return block
+
+    def compile_define(self, stmt: Stmt, name: Token, value: Closure) -> Closure:
+        slot = self.interpreter.slots.get(stmt)
+        if slot is not None:
+            def define_local(env):
+                env.slots[slot] = value(env)
+            return define_local
+
+        global_env = self.interpreter.globals
+        lexeme = name.LEXEME
+
+        def define_global(env):
+            global_env.define(lexeme, value(env))
+        return define_global
+
+    def visitBlockStmt(self, stmt: Block) -> Closure:
+        body = self.compile_block(stmt.statements)
+        size = self.interpreter.frame_sizes.get(stmt)
+        if size is None:
+            return body
+
+        def scoped_block(env):
+            return body(Frame([None] * size, env))
+        return scoped_block
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt) -> Closure:
+        expression = self.compile_expr(stmt.expression)
+
+        def expression_stmt(env):
+            expression(env)
+        return expression_stmt
+
+    def visitFunctionStmt(self, stmt: Function) -> Closure:
+        body = self.compile_block(stmt.body)
+        frame_size = self.interpreter.frame_sizes[stmt]
+        global_env = self.interpreter.globals
+        # The body is compiled once, but each run of the declaration makes a new function, as LoxFunction does
+        return self.compile_define(stmt, stmt.name, lambda env: ClosureFunction(stmt, body, frame_size, global_env))
+
+    def visitIfStmt(self, stmt: If) -> Closure:
+        condition = self.compile_expr(stmt.condition)
+        then_branch = self.compile_stmt(stmt.then_branch)
+        if not stmt.else_branch:
+            def if_stmt(env):
+                value = condition(env)
+                if value is not None and value is not False:
+                    return then_branch(env)
+                return None
+            return if_stmt
+
+        else_branch = self.compile_stmt(stmt.else_branch)
+
+        def if_else_stmt(env):
+            value = condition(env)
+            if value is not None and value is not False:
+                return then_branch(env)
+            return else_branch(env)
+        return if_else_stmt
+
+    def visitBreakStmt(self, stmt: Break) -> Closure:
+        def break_stmt(env):
+            return BREAK
+        return break_stmt
+
+    def visitPrintStmt(self, stmt: Print) -> Closure:
+        expression = self.compile_expr(stmt.expression)
+        stringify = self.interpreter.stringify
+        write_line = self.interpreter.output.write_line
+
+        def print_stmt(env):
+            write_line(stringify(expression(env)))
+        return print_stmt
+
+    def visitReturnStmt(self, stmt: Return) -> Closure:
+        if stmt in self.interpreter.tail_calls:
+            return self.compile_tail_call(stmt.value)
+
+        value = self.compile_expr(stmt.value) if stmt.value else (lambda env: None)
+        interpreter = self.interpreter
+
+        def return_stmt(env):
+            interpreter.return_value = value(env)
+            return RETURN
+        return return_stmt
+
+    def compile_tail_call(self, expr: Call) -> Closure:
+        callee_expr = self.compile_expr(expr.callee)
+        arguments = [self.compile_expr(argument) for argument in expr.arguments]
+        argc = len(arguments)
+        paren = expr.paren
+        interpreter = self.interpreter
+
+        def tail_call(env):
+            callee = callee_expr(env)
+            if not isinstance(callee, LoxCallable):
+                raise LoxRuntimeError(paren, "Can only call functions or classes.")
+
+            args = [argument(env) for argument in arguments]
+            if argc != callee.arity():
+                raise LoxRuntimeError(paren, f"Expected {callee.arity()} args but got {argc} args.")
+            if isinstance(callee, ClosureFunction):
+                interpreter.tail_call = (callee, args)
+                return TAIL_CALL
+
+            try:
+                interpreter.return_value = callee.call(interpreter, args)
+            except NativeError as error:
+                raise LoxRuntimeError(paren, error.message) from None
+            return RETURN
+        return tail_call
+
+    def visitVarStmt(self, stmt: VarStmt) -> Closure:
+        initializer = self.compile_expr(stmt.initializer) if stmt.initializer != None else (lambda env: None)
+        return self.compile_define(stmt, stmt.name, initializer)
+
+    def visitWhileStmt(self, stmt: While) -> Closure:
+        condition = self.compile_expr(stmt.condition)
+        body = self.compile_stmt(stmt.body) if stmt.body else (lambda env: None)
+
+        def while_stmt(env):
+            while True:
+                value = condition(env)
+                if value is None or value is False:
+                    return
+                completion = body(env)
+                if completion is BREAK:
+                    return None
+                if completion is not None:
+                    return completion
+        return while_stmt
+
+    def visitAssignExpr(self, expr: Assign) -> Closure:
+        value = self.compile_expr(expr.value)
+        local = self.interpreter.locals.get(expr)
+
+        if local is None:
+            global_env = self.interpreter.globals
+
+            def assign_global(env):
+                result = value(env)
+                global_env.assign(expr.name, result)
+                return result
+            return assign_global
+
+        depth, slot = local
+        if depth == 0:
+            def assign_local(env):
+                result = env.slots[slot] = value(env)
+                return result
+            return assign_local
+
+        def assign_enclosing(env):
+            result = value(env)
+            env.assign_at(depth, slot, result)
+            return result
+        return assign_enclosing
+
+    def visitBinaryExpr(self, expr: Binary) -> Closure:
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+        operator = expr.operator
+        is_equal = self.interpreter.is_equal
+
+        match operator.TYPE:
+            case T.PLUS:
+                stringify = self.interpreter.stringify
+
+                def add(env):
+                    a = left(env)
+                    b = right(env)
+                    if isinstance(a, float) and isinstance(b, float):
+                        return a + b
+                    if a.__class__ is str and b.__class__ is str:
+                        return a + b
+                    if isinstance(a, str) or isinstance(b, str):
+                        return stringify(a) + stringify(b)
+                    raise LoxRuntimeError(operator, "Expect operands to be two numbers or two strings")
+                return add
+            case T.MINUS:
+                def subtract(env):
+                    a = left(env)
+                    b = right(env)
+                    if isinstance(a, float) and isinstance(b, float):
+                        return a - b
+                    raise LoxRuntimeError(operator, "Expected numerical operands")
+                return subtract
+            case T.STAR:
+                def multiply(env):
+                    a = left(env)
+                    b = right(env)
+                    if isinstance(a, float) and isinstance(b, float):
+                        return a * b
+                    raise LoxRuntimeError(operator, "Expected numerical operands")
+                return multiply
+            case T.SLASH:
+                def divide(env):
+                    a = left(env)
+                    b = right(env)
+                    if isinstance(a, float) and isinstance(b, float):
+                        if b == 0:
+                            raise LoxRuntimeError(operator, "Divide by zero")
+                        return a / b
+                    raise LoxRuntimeError(operator, "Expected numerical operands")
+                return divide
+            case T.GREATER:
+                def greater(env):
+                    a = left(env)
+                    b = right(env)
+                    if isinstance(a, float) and isinstance(b, float):
+                        return a > b
+                    raise LoxRuntimeError(operator, "Expected numerical operands")
+                return greater
+            case T.GREATER_EQUAL:
+                def greater_equal(env):
+                    a = left(env)
+                    b = right(env)
+                    if isinstance(a, float) and isinstance(b, float):
+                        return a >= b
+                    raise LoxRuntimeError(operator, "Expected numerical operands")
+                return greater_equal
+            case T.LESS:
+                def less(env):
+                    a = left(env)
+                    b = right(env)
+                    if isinstance(a, float) and isinstance(b, float):
+                        return a < b
+                    raise LoxRuntimeError(operator, "Expected numerical operands")
+                return less
+            case T.LESS_EQUAL:
+                def less_equal(env):
+                    a = left(env)
+                    b = right(env)
+                    if isinstance(a, float) and isinstance(b, float):
+                        return a <= b
+                    raise LoxRuntimeError(operator, "Expected numerical operands")
+                return less_equal
+            case T.EQUAL_EQUAL:
+                return lambda env: is_equal(left(env), right(env))
+            case T.BANG_EQUAL:
+                return lambda env: not is_equal(left(env), right(env))
+
+        # Unreachable
+        return lambda env: None
+
+    def visitCallExpr(self, expr: Call) -> Closure:
+        callee_expr = self.compile_expr(expr.callee)
+        arguments = [self.compile_expr(argument) for argument in expr.arguments]
+        argc = len(arguments)
+        paren = expr.paren
+        interpreter = self.interpreter
+
+        def call(env):
+            callee = callee_expr(env)
+            if not isinstance(callee, LoxCallable):
+                raise LoxRuntimeError(paren, "Can only call functions or classes.")
+
+            args = [argument(env) for argument in arguments]
+            if argc != callee.arity():
+                raise LoxRuntimeError(paren, f"Expected {callee.arity()} args but got {argc} args.")
+            try:
+                return callee.call(interpreter, args)
+            except NativeError as error:
+                raise LoxRuntimeError(paren, error.message) from None
+        return call
+
+    def visitGroupingExpr(self, expr: Grouping) -> Closure:
+        return self.compile_expr(expr.expression)
+
+    def visitLiteralExpr(self, expr: Literal) -> Closure:
+        value = expr.value
+        return lambda env: value
+
+    def visitLogicalExpr(self, expr: Logical) -> Closure:
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+
+        if expr.operator.TYPE == T.OR:
+            def logical_or(env):
+                value = left(env)
+                if value is not None and value is not False:
+                    return value
+                return right(env)
+            return logical_or
+
+        def logical_and(env):
+            value = left(env)
+            if value is None or value is False:
+                return value
+            return right(env)
+        return logical_and
+
+    def visitUnaryExpr(self, expr: Unary) -> Closure:
+        right = self.compile_expr(expr.right)
+        operator = expr.operator
+
+        if operator.TYPE == T.BANG:
+            def logical_not(env):
+                value = right(env)
+                return value is None or value is False
+            return logical_not
+
+        def negate(env):
+            value = right(env)
+            if isinstance(value, float):
+                return -value
+            raise LoxRuntimeError(operator, "Expected numerical operand")
+        return negate
+
+    def visitVariableExpr(self, expr: VarExpr) -> Closure:
+        local = self.interpreter.locals.get(expr)
+
+        if local is None:
+            values = self.interpreter.globals.values
+            name = expr.name
+            lexeme = name.LEXEME
+
+            def get_global(env):
+                try:
+                    return values[lexeme]
+                except KeyError:
+                    raise LoxRuntimeError(name, f'Undefined variable {lexeme}.')
+            return get_global
+
+        depth, slot = local
+        if depth == 0:
+            return lambda env: env.slots[slot]
+        return lambda env: env.get_at(depth, slot)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+from tokenType import TokenType as T
+from expr import Assign, Variable as VarExpr, Visitor as ExprVisitor, Expr, Literal, Unary, Binary, Grouping, Logical, Call
+from stmt import ExpressionStmt, Print, Var as VarStmt, Visitor as StmtVisitor, Stmt, Block, If, While, Break, Function, Return
+from tokens import Token
+from bytecode import Chunk, FunctionProto
+import bytecode as op
+
+BINARY_OPCODES = {
+    T.PLUS: op.ADD,
+    T.MINUS: op.SUBTRACT,
+    T.STAR: op.MULTIPLY,
+    T.SLASH: op.DIVIDE,
+    T.GREATER: op.GREATER,
+    T.GREATER_EQUAL: op.GREATER_EQUAL,
+    T.LESS: op.LESS,
+    T.LESS_EQUAL: op.LESS_EQUAL,
+}
+
+
+class Compiler(ExprVisitor, StmtVisitor):
+    """
+    Compiles resolved `Stmt`/`Expr` trees into bytecode for the `VM`.
+    Scope distances, slots and frame sizes are read from the side tables the Resolver filled in on the interpreter,
+    so the compiled code uses the same `Frame` layout as the tree-walker.
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.chunk = Chunk()
+        self.logical_jumps: dict[Logical, int] = {}  # `and`/`or` expressions -> jump operand awaiting its right side
+        self.scope_depth = 0  # Number of PUSH_SCOPEs currently open in this function
+        self.loops: list[tuple[int, list[int]]] = []  # (scope depth at the loop, offsets of `break` jumps to patch)
+
+    def compile(self, statements: list[Stmt]) -> FunctionProto:
+        """Compile a top-level script into a zero-argument FunctionProto run against the globals."""
+        for statement in statements:
+            self.compile_stmt(statement)
+        self.emit_return()
+        return FunctionProto("script", 0, self.chunk, 0, None)
+
+    def compile_function(self, function: Function) -> FunctionProto:
+        for statement in function.body:
+            self.compile_stmt(statement)
+        self.emit_return()
+        return FunctionProto(function.name.LEXEME, len(function.params), self.chunk,
+                             self.interpreter.frame_sizes[function], function)
+
+    def compile_stmt(self, stmt: Stmt) -> None:
+        stmt.accept(self)
+
+    def compile_expr(self, expr: Expr) -> None:
+        # Expressions can nest far deeper than Python's recursion limit, so they are compiled from an explicit
+        # work list. Each visit method returns its node's steps in order: child expressions to compile and
+        # (method, node) pairs that emit the node's own instructions.
+        work: list[Expr | tuple] = [expr]
+        while work:
+            step = work.pop()
+            if isinstance(step, tuple):
+                step[0](step[1])
+            else:
+                work.extend(reversed(step.accept(self)))
+
+    def emit(self, *code: int) -> int:
+        return self.chunk.emit(*code)
+
+    def emit_constant(self, value: object) -> None:
+        self.emit(op.CONSTANT, self.chunk.add_constant(value))
+
+    def emit_return(self) -> None:
+        self.emit_constant(None)
+        self.emit(op.RETURN)
+
+    def emit_jump(self, opcode: int) -> int:
+        # Emitted with a placeholder target; returns the operand offset for `patch_jump`
+        return self.emit(opcode, -1) + 1
+
+    def patch_jump(self, operand: int) -> None:
+        self.chunk.code[operand] = len(self.chunk.code)
+
+    def token(self, token: Token) -> int:
+        return self.chunk.add_constant(token)
+
+    def define(self, stmt: Stmt, name: Token) -> None:
+        slot = self.interpreter.slots.get(stmt)
+        if slot is not None:
+            self.emit(op.DEFINE_LOCAL, slot)
+        else:
+            self.emit(op.DEFINE_GLOBAL, self.token(name))
+
+    def visitBlockStmt(self, stmt: Block) -> None:
+        size = self.interpreter.frame_sizes.get(stmt)
+        if size is None:
+            for statement in stmt.statements:
+                self.compile_stmt(statement)
+            return None
+
+        self.emit(op.PUSH_SCOPE, size)
+        self.scope_depth += 1
+        for statement in stmt.statements:
+            self.compile_stmt(statement)
+        self.scope_depth -= 1
+        self.emit(op.POP_SCOPE)
+        return None
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt) -> None:
+        self.compile_expr(stmt.expression)
+        self.emit(op.POP)
+        return None
+
+    def visitFunctionStmt(self, stmt: Function) -> None:
+        proto = Compiler(self.interpreter).compile_function(stmt)
+        self.emit(op.FUNCTION, self.chunk.add_constant(proto))
+        self.define(stmt, stmt.name)
+        return None
+
+    def visitIfStmt(self, stmt: If) -> None:
+        self.compile_expr(stmt.condition)
+        else_jump = self.emit_jump(op.JUMP_IF_FALSE)
+        self.compile_stmt(stmt.then_branch)
+        if stmt.else_branch:
+            end_jump = self.emit_jump(op.JUMP)
+            self.patch_jump(else_jump)
+            self.compile_stmt(stmt.else_branch)
+            self.patch_jump(end_jump)
+        else:
+            self.patch_jump(else_jump)
+        return None
+
+    def visitBreakStmt(self, stmt: Break) -> None:
+        loop_depth, breaks = self.loops[-1]
+        for _ in range(self.scope_depth - loop_depth):
+            self.emit(op.POP_SCOPE)
+        breaks.append(self.emit_jump(op.JUMP))
+        return None
+
+    def visitPrintStmt(self, stmt: Print) -> None:
+        self.compile_expr(stmt.expression)
+        self.emit(op.PRINT)
+        return None
+
+    def visitReturnStmt(self, stmt: Return) -> None:
+        # The VM restores the caller's Frame on RETURN, so open scopes need no POP_SCOPE
+        if stmt in self.interpreter.tail_calls:
+            call = stmt.value
+            self.compile_expr(call.callee)
+            for argument in call.arguments:
+                self.compile_expr(argument)
+            self.emit(op.TAIL_CALL, len(call.arguments), self.token(call.paren))
+            return None
+
+        if stmt.value:
+            self.compile_expr(stmt.value)
+        else:
+            self.emit_constant(None)
+        self.emit(op.RETURN)
+        return None
+
+    def visitVarStmt(self, stmt: VarStmt) -> None:
+        if stmt.initializer != None:
+            self.compile_expr(stmt.initializer)
+        else:
+            self.emit_constant(None)
+        self.define(stmt, stmt.name)
+        return None
+
+    def visitWhileStmt(self, stmt: While) -> None:
+        loop_start = len(self.chunk.code)
+        self.compile_expr(stmt.condition)
+        exit_jump = self.emit_jump(op.JUMP_IF_FALSE)
+
+        self.loops.append((self.scope_depth, []))
+        if stmt.body:
+            self.compile_stmt(stmt.body)
+        self.emit(op.JUMP, loop_start)
+        _, breaks = self.loops.pop()
+
+        self.patch_jump(exit_jump)
+        for operand in breaks:
+            self.patch_jump(operand)
+        return None
+
+    def visitAssignExpr(self, expr: Assign) -> tuple:
+        return (expr.value, (self.emit_assign, expr))
+
+    def emit_assign(self, expr: Assign) -> None:
+        local = self.interpreter.locals.get(expr)
+        if local is None:
+            self.emit(op.SET_GLOBAL, self.token(expr.name))
+        elif local[0] == 0:
+            self.emit(op.SET_LOCAL_0, local[1])
+        else:
+            self.emit(op.SET_LOCAL, local[0], local[1])
+        return None
+
+    def visitBinaryExpr(self, expr: Binary) -> tuple:
+        return (expr.left, expr.right, (self.emit_binary, expr))
+
+    def emit_binary(self, expr: Binary) -> None:
+        match expr.operator.TYPE:
+            case T.EQUAL_EQUAL:
+                self.emit(op.EQUAL)
+            case T.BANG_EQUAL:
+                self.emit(op.NOT_EQUAL)
+            case operator:
+                self.emit(BINARY_OPCODES[operator], self.token(expr.operator))
+        return None
+
+    def visitCallExpr(self, expr: Call) -> tuple:
+        return (expr.callee, *expr.arguments, (self.emit_call, expr))
+
+    def emit_call(self, expr: Call) -> None:
+        self.emit(op.CALL, len(expr.arguments), self.token(expr.paren))
+
+    def visitGroupingExpr(self, expr: Grouping) -> tuple:
+        return (expr.expression,)
+
+    def visitLiteralExpr(self, expr: Literal) -> tuple:
+        self.emit_constant(expr.value)
+        return ()
+
+    def visitLogicalExpr(self, expr: Logical) -> tuple:
+        return (expr.left, (self.emit_logical_jump, expr), expr.right, (self.patch_logical_jump, expr))
+
+    def emit_logical_jump(self, expr: Logical) -> None:
+        if expr.operator.TYPE == T.OR:
+            self.logical_jumps[expr] = self.emit_jump(op.JUMP_IF_TRUE_OR_POP)
+        else:
+            self.logical_jumps[expr] = self.emit_jump(op.JUMP_IF_FALSE_OR_POP)
+
+    def patch_logical_jump(self, expr: Logical) -> None:
+        self.patch_jump(self.logical_jumps.pop(expr))
+
+    def visitUnaryExpr(self, expr: Unary) -> tuple:
+        return (expr.right, (self.emit_unary, expr))
+
+    def emit_unary(self, expr: Unary) -> None:
+        if expr.operator.TYPE == T.BANG:
+            self.emit(op.NOT)
+        else:
+            self.emit(op.NEGATE, self.token(expr.operator))
+        return None
+
+    def visitVariableExpr(self, expr: VarExpr) -> tuple:
+        local = self.interpreter.locals.get(expr)
+        if local is None:
+            self.emit(op.GET_GLOBAL, self.token(expr.name))
+        elif local[0] == 0:
+            self.emit(op.GET_LOCAL_0, local[1])
+        else:
+            self.emit(op.GET_LOCAL, local[0], local[1])
+        return ()
@@ -0,0 +1,25 @@
+"""
+Completion signals for statement execution.
+
+Executing a statement returns None when it completes normally, `BREAK` when a `break` is leaving the
+innermost loop, or `RETURN` when a `return` is leaving the current function. The returned value is left in
+the interpreter's `return_value` for the function call to pick up. A `return f(...)` in tail position
+returns `TAIL_CALL` instead, leaving the function and its arguments in the interpreter's `tail_call`; the
+current call then runs `f` itself rather than nesting a new call, so tail recursion uses constant stack. Loops and calls check the signal instead
+of catching an exception, so `break` and `return` cost a comparison rather than a raise and unwind.
+"""
+
+
+class Completion:
+    __slots__ = ("kind",)
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def __repr__(self) -> str:
+        return f"<{self.kind}>"
+
+
+BREAK = Completion("break")
+RETURN = Completion("return")
+TAIL_CALL = Completion("tail call")
@@ -1,16 +1,24 @@
 from __future__ import annotations
+from itertools import count
 from tokens import Token
 from error_handler import LoxRuntimeError
 
+# Versions are drawn from one counter shared by every Environment, so a cache filled against one interpreter's
+# globals can never match another's
+VERSIONS = count()
+
 
 class Environment():
 
     def __init__(self, enclosing: Environment | None = None):
         self.values = {}
         self.enclosing = enclosing
+        # Changed whenever a name is defined, so inline caches filled at an older version re-check their lookup
+        self.version = next(VERSIONS)
 
     def define(self, name: str, value: object) -> None:
         self.values[name] = value
+        self.version = next(VERSIONS)
 
     def get(self, name: Token) -> None:
         if name.LEXEME in self.values:
@@ -31,3 +39,28 @@ class Environment():
             return
 
         raise LoxRuntimeError(name, f"Undefined variable {name.LEXEME}.")
+
+
+class Frame():
+    """
+    Storage for a local scope (a block or a function call). Locals and parameters live in a fixed-size list
+    at slot indices assigned by the Resolver, so reads and writes are a list index instead of a dict probe.
+    Name-based `Environment`s are only used for the globals.
+    """
+    __slots__ = ("slots", "enclosing")
+
+    def __init__(self, slots: list[object], enclosing: Frame | Environment):
+        self.slots = slots
+        self.enclosing = enclosing
+
+    def get_at(self, distance: int, slot: int) -> object:
+        frame = self
+        for _ in range(distance):
+            frame = frame.enclosing
+        return frame.slots[slot]
+
+    def assign_at(self, distance: int, slot: int, value: object) -> None:
+        frame = self
+        for _ in range(distance):
+            frame = frame.enclosing
+        frame.slots[slot] = value
@@ -10,6 +10,7 @@ had_runtime_error = False
 
 def report(line: int, where: str, message: str):
     # TODO: maybe make this have a 'type' parameter so that it can be used to convey error type, e.g RuntimeError vs ParseError (or in future more specific errors)
+    global had_error
     print(f"[line {line};{where}] ERROR: {message}")
     had_error = True
 
@@ -17,7 +18,7 @@ def report(line: int, where: str, message: str):
 def error(message: str, line=None, token: Token | None = None):
     if line:
         report(line, "", message)
-    elif token == T.EOF:
+    elif token and token.TYPE == T.EOF:
         report(token.LINE, "", message)
     elif token:
         report(token.LINE, "", f"`{token.LEXEME}` {message}")
@@ -27,28 +28,24 @@ def error(message: str, line=None, token: Token | None = None):
 
 
 class LoxRuntimeError(RuntimeError):
-    def __init__(self, token: Token, message: str):
+    def __init__(self, token: Token | None, message: str):
         self.token = token
         self.message = message
         self.RuntimeError = RuntimeError(message)
 
 
-def runtime_error(error: LoxRuntimeError):
-    print(f'[line {error.token.LINE};] RuntimeError: {error.message}')
-    had_runtime_error = True
-
-
-class BreakException(SyntaxError):
-    def __init__(self, token: Token, message: str):
-        self.token = token
+class NativeError(RuntimeError):
+    """
+    Raised by native functions, which have no token to report an error at. The interpreter re-raises it as a
+    LoxRuntimeError at the `(` of the call that reached the native.
+    """
+    def __init__(self, message: str):
         self.message = message
-        self.SyntaxError = SyntaxError(message)
-
-# These are not actual errors but instead used to jump around call stack. However, to avoid circular imports they are in this file and not `interpreter.py`
 
-class BreakException(RuntimeError): # Used to jump if `break` encountered.
-    pass
 
-class ReturnException(RuntimeError):
-    def __init__(self, value: object):
-        self.value = value
+def runtime_error(error: LoxRuntimeError):
+    global had_runtime_error
+    # A stack overflow can be reported without a token if none was found on the Python stack
+    where = f'[line {error.token.LINE};] ' if error.token is not None else ''
+    print(f'{where}RuntimeError: {error.message}')
+    had_runtime_error = True
@@ -1,17 +1,22 @@
+# Generated by Tools/generate_ast.py; edit the type list there instead of this file.
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from tokens import Token
 
 
 class Expr(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor: Visitor): pass
 
     @abstractmethod
-    def to_string(self): pass
+    def to_string(self) -> str: pass
 
 
 class Assign(Expr):
+    __slots__ = ("name", "value")
+
     def __init__(self, name: Token, value: Expr):
         self.name = name
         self.value = value
@@ -19,57 +24,87 @@ class Assign(Expr):
     def accept(self, visitor: Visitor):
         return visitor.visitAssignExpr(self)
 
-    def to_string(self):
+    def __reduce__(self):
+        return (Assign, (self.name, self.value))
+
+    def to_string(self) -> str:
         return f"Assign({self.name.to_string()}, {self.value.to_string()})"
 
 
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right", "cache_hits")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
         self.right = right
+        self.cache_hits: int = 0
 
     def accept(self, visitor: Visitor):
         return visitor.visitBinaryExpr(self)
 
-    def to_string(self):
+    def __reduce__(self):
+        return (Binary, (self.left, self.operator, self.right))
+
+    def to_string(self) -> str:
         return f"Binary({self.left.to_string()}, {self.operator.to_string()}, {self.right.to_string()})"
 
+
 class Call(Expr):
+    __slots__ = ("callee", "paren", "arguments", "cache_version", "cache_callee")
+
     def __init__(self, callee: Expr, paren: Token, arguments: list[Expr]):
         self.callee = callee
         self.paren = paren
         self.arguments = arguments
-    
+        self.cache_version: int = -1
+        self.cache_callee: object = None
+
     def accept(self, visitor: Visitor):
         return visitor.visitCallExpr(self)
-    
-    def to_string(self):
-        return f"Call({self.callee.to_string()}, {[arg.to_string() for arg in self.arguments]})"
+
+    def __reduce__(self):
+        return (Call, (self.callee, self.paren, self.arguments))
+
+    def to_string(self) -> str:
+        return f"Call({self.callee.to_string()}, {self.paren.to_string()}, [{', '.join(item.to_string() for item in self.arguments)}])"
+
 
 class Grouping(Expr):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
     def accept(self, visitor: Visitor):
         return visitor.visitGroupingExpr(self)
 
-    def to_string(self):
+    def __reduce__(self):
+        return (Grouping, (self.expression,))
+
+    def to_string(self) -> str:
         return f"Grouping({self.expression.to_string()})"
 
 
 class Literal(Expr):
+    __slots__ = ("value",)
+
     def __init__(self, value: object):
         self.value = value
 
     def accept(self, visitor: Visitor):
         return visitor.visitLiteralExpr(self)
 
-    def to_string(self):
+    def __reduce__(self):
+        return (Literal, (self.value,))
+
+    def to_string(self) -> str:
         return f"Literal({self.value})"
 
 
 class Logical(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -78,57 +113,71 @@ class Logical(Expr):
     def accept(self, visitor: Visitor):
         return visitor.visitLogicalExpr(self)
 
-    def to_string(self):
+    def __reduce__(self):
+        return (Logical, (self.left, self.operator, self.right))
+
+    def to_string(self) -> str:
         return f"Logical({self.left.to_string()}, {self.operator.to_string()}, {self.right.to_string()})"
 
 
 class Unary(Expr):
+    __slots__ = ("operator", "right", "cache_hits")
+
     def __init__(self, operator: Token, right: Expr):
         self.operator = operator
         self.right = right
+        self.cache_hits: int = 0
 
     def accept(self, visitor: Visitor):
         return visitor.visitUnaryExpr(self)
 
-    def to_string(self):
+    def __reduce__(self):
+        return (Unary, (self.operator, self.right))
+
+    def to_string(self) -> str:
         return f"Unary({self.operator.to_string()}, {self.right.to_string()})"
 
 
 class Variable(Expr):
+    __slots__ = ("name", "cache_version", "cache_depth", "cache_slot")
+
     def __init__(self, name: Token):
         self.name = name
+        self.cache_version: int = -1
+        self.cache_depth: int = 0
+        self.cache_slot: int = 0
 
     def accept(self, visitor: Visitor):
         return visitor.visitVariableExpr(self)
 
-    def to_string(self):
+    def __reduce__(self):
+        return (Variable, (self.name,))
+
+    def to_string(self) -> str:
         return f"VarExpr({self.name.to_string()})"
 
 
 class Visitor:
     @abstractmethod
-    def visitBinaryExpr(self, expr: Binary): pass
-
-    @abstractmethod
-    def visitGroupingExpr(self, expr: Grouping): pass
+    def visitAssignExpr(self, expr: Assign): pass
 
     @abstractmethod
-    def visitLiteralExpr(self, expr: Literal): pass
+    def visitBinaryExpr(self, expr: Binary): pass
 
     @abstractmethod
-    def visitUnaryExpr(self, expr: Unary): pass
+    def visitCallExpr(self, expr: Call): pass
 
     @abstractmethod
-    def visitVariableExpr(self, expr: Variable): pass
+    def visitGroupingExpr(self, expr: Grouping): pass
 
     @abstractmethod
-    def visitAssignExpr(self, expr: Assign): pass
+    def visitLiteralExpr(self, expr: Literal): pass
 
     @abstractmethod
     def visitLogicalExpr(self, expr: Logical): pass
 
     @abstractmethod
-    def visitCallExpr(self, expr: Call): pass
+    def visitUnaryExpr(self, expr: Unary): pass
 
     @abstractmethod
-    def visitFunctionExpr(self, expr: Function): pass
\ No newline at end of file
+    def visitVariableExpr(self, expr: Variable): pass
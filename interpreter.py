@@ -3,75 +3,142 @@ from tokenType import TokenType as T
 from tokens import Token
 from expr import Assign, Variable as VarExpr, Visitor as ExprVisitor, Expr, Literal, Unary, Binary, Grouping, Logical, Call
 from stmt import ExpressionStmt, Print, Var as VarStmt, Visitor as StmtVisitor, Stmt, Block, If, While, Break, Function, Return
-from error_handler import LoxRuntimeError, runtime_error, BreakException, ReturnException
-from environment import Environment
+from error_handler import LoxRuntimeError, NativeError, runtime_error
+from completion import Completion, BREAK, RETURN, TAIL_CALL
+from environment import Environment, Frame
 from  lox_callable import LoxCallable, LoxFunction 
-from native import Clock
-import logging
+from native import Clock, format_value
+from memoize import Memoize, MemoStats
+import arrays
+import maps
+import strings
+from compiler import Compiler
+from vm import VM, DEFAULT_STACK_LIMIT
+from closure_compiler import ClosureCompiler
+from quickening import FloatBinary, FloatNegate, FLOAT_BINARY, QUICKEN_AFTER
+from output import OutputSink, StdoutSink
+import tracing
+
+ENGINES = ("tree", "vm", "closure")
+
+# `Variable.cache_version` of a node known to read a local; global versions are never negative
+LOCAL = -2
+
+
+def overflow_token(traceback) -> Token | None:
+    """The token nearest the innermost frame of a RecursionError's traceback, to report the overflow at."""
+    frames = []
+    while traceback is not None:
+        frames.append(traceback.tb_frame)
+        traceback = traceback.tb_next
+    for frame in reversed(frames):
+        for value in frame.f_locals.values():
+            token = value if isinstance(value, Token) else tracing.node_token(value) if isinstance(value, (Expr, Stmt)) else None
+            if token is not None:
+                return token
+    return None
 
-# class BreakException(RuntimeError): # Used to jump if `break` encountered.
-#     pass
-
-# class ReturnException(RuntimeError):
-#     def __init__(self, value: object):
-#         self.value = value
 
 class Interpreter(ExprVisitor, StmtVisitor):
 
-    def __init__(self):
+    def __init__(self, engine: str = "tree", stack_limit: int = DEFAULT_STACK_LIMIT, output: OutputSink | None = None):
+        # "tree" walks the AST with this visitor; "vm" compiles it to bytecode for the VM;
+        # "closure" compiles it to nested Python closures.
+        # `stack_limit` bounds nested Lox calls on the VM, which does not use Python recursion for them.
+        # `output` receives the lines `print` writes; by default each is written to stdout as it is printed.
+        self.engine = engine
+        self.output = output if output is not None else StdoutSink()
+        self.vm = VM(self, stack_limit) if engine == "vm" else None
         self.globals = Environment()
         self.environment = self.globals
-        self.globals.define("clock", Clock())
+        # Filled in by the Resolver
+        self.locals: dict[Expr, tuple[int, int]] = {}  # variable reference -> (scope distance, slot)
+        self.slots: dict[Stmt, int] = {}  # local declaration -> slot
+        self.frame_sizes: dict[Stmt, int] = {}  # block or function -> number of slots in its Frame
+        self.tail_calls: set[Return] = set()  # `return f(...)` statements
+        for native in (Clock(), Memoize(), MemoStats()) + arrays.NATIVES + maps.NATIVES + strings.NATIVES:
+            self.globals.define(native.name, native)
+        # Set by a `return` statement alongside the RETURN completion, read by the function call it leaves
+        self.return_value: object = None
+        # Set by a tail call alongside the TAIL_CALL completion: the function to run next and its arguments
+        self.tail_call: tuple[LoxFunction, list[object]] | None = None
+        self.tracer: tracing.Tracer | None = None
+
+    def set_tracer(self, tracer: tracing.Tracer | None) -> None:
+        """Report execution events to `tracer`, or stop tracing if it is None. Only the tree engine is traced."""
+        if tracer is not None and self.engine != "tree":
+            raise ValueError(f"tracing is not supported by the {self.engine} engine")
+        tracing.uninstall(self)
+        self.tracer = tracer
+        if tracer is not None:
+            tracing.install(self, tracer)
 
     def interpret(self, statements: list[Stmt]) -> None:
         try:
+            if self.vm:
+                self.vm.interpret(Compiler(self).compile(statements))
+                return
+            if self.engine == "closure":
+                ClosureCompiler(self).compile(statements)()
+                return
+
             for statement in statements:
-                logging.debug(f"Executing {statement.to_string()}")
                 self.execute(statement)
         except LoxRuntimeError as error:
+            # Anything printed before the error is written out ahead of its report
+            self.output.flush()
             runtime_error(error)
+        except RecursionError as error:
+            # The tree and closure engines nest Python calls for Lox calls and expressions, so they overflow
+            # Python's stack where the VM would check its own `stack_limit`
+            self.output.flush()
+            runtime_error(LoxRuntimeError(overflow_token(error.__traceback__), "Stack overflow."))
         except AttributeError:
             # temp
+            self.output.flush()
             print("Handle NoneType for statement")
+        finally:
+            self.output.flush()
+            # Blocks don't restore the environment when an error unwinds through them, so reset it for the next run
+            self.environment = self.globals
+
+    def resolve(self, expr: Expr, depth: int, slot: int) -> None:
+        self.locals[expr] = (depth, slot)
+
+    def declare(self, stmt: Stmt, slot: int) -> None:
+        self.slots[stmt] = slot
+
+    def allocate(self, node: Stmt, size: int) -> None:
+        self.frame_sizes[node] = size
+
+    def mark_tail_call(self, stmt: Return) -> None:
+        self.tail_calls.add(stmt)
+
+    def define(self, stmt: Stmt, name: Token, value: object) -> None:
+        slot = self.slots.get(stmt)
+        if slot is not None:
+            self.environment.slots[slot] = value
+        else:
+            self.globals.define(name.LEXEME, value)
 
-    def execute(self, stmt: Stmt) -> None:
-        stmt.accept(self)
+    def execute(self, stmt: Stmt) -> Completion | None:
+        return stmt.accept(self)
 
-    def execute_block(self, statements: list[Stmt], environment: Environment) -> None:
+    def execute_block(self, statements: list[Stmt], environment: Environment | Frame) -> Completion | None:
         previous_env = self.environment
-        logging.debug(f"Current environment is {self.environment.values}")
+        self.environment = environment
 
-        try:
-            logging.debug(f"Switching environment to {environment.values}")
-            self.environment = environment
-            logging.debug(f"Environment vals are {self.environment.values}")
+        for stmt in statements:
+            completion = self.execute(stmt)
+            if completion is not None:
+                self.environment = previous_env
+                return completion
 
-            for stmt in statements:
-                self.execute(stmt)
-        finally:
-            logging.debug(
-                f"Switching back to previous_env: {previous_env.values}")
-            self.environment = previous_env
-            logging.debug(f"Environment vals are {self.environment.values}")
-
-    def stringify(self, value: object) -> str:
-        if value == None:
-            return "nil"
-
-        if isinstance(value, float):
-            text = str(value)
-            if text.endswith('.0'):
-                text = text[0:-2]
-            return text
-
-        if isinstance(value, bool):
-            # Lox uses lowercase 'true' and 'false' keywords
-            if value == True:
-                return 'true'
-            else:
-                return 'false'
-
-        return str(value)
+        self.environment = previous_env
+        return None
+
+    # The one formatting rule, shared with the natives (see `native.format_value`)
+    stringify = staticmethod(format_value)
 
     def check_number_operands(self, operator: Token, left: object, right: object) -> None:
         if isinstance(left, float) and isinstance(right, float):
@@ -98,7 +165,6 @@ class Interpreter(ExprVisitor, StmtVisitor):
                 f"Value `{value}` cannot be converted to float. Check interpreter; should throw LoxRuntimeException")
 
     def evaluate(self, expr: Expr) -> object:
-        logging.debug(f"Evaluating expression {expr.to_string()}")
         return expr.accept(self)
 
     def is_truthy(self, _object: object) -> bool:
@@ -114,10 +180,17 @@ class Interpreter(ExprVisitor, StmtVisitor):
             return False
         return a == b
 
-    def visitBlockStmt(self, stmt: Block) -> None:
-        self.execute_block(stmt.statements, Environment(
-            enclosing=self.environment))
-        return None
+    def visitBlockStmt(self, stmt: Block) -> Completion | None:
+        size = self.frame_sizes.get(stmt)
+        if size is None:
+            # No declarations, so the block shares the enclosing scope
+            for statement in stmt.statements:
+                completion = self.execute(statement)
+                if completion is not None:
+                    return completion
+            return None
+
+        return self.execute_block(stmt.statements, Frame([None] * size, self.environment))
 
     def visitExpressionStmt(self, stmt: ExpressionStmt) -> None:
         self.evaluate(stmt.expression)
@@ -125,56 +198,90 @@ class Interpreter(ExprVisitor, StmtVisitor):
     
     def visitFunctionStmt(self, stmt: Function) -> None:
         function = LoxFunction(stmt)
-        self.environment.define(stmt.name.LEXEME, function)
+        self.define(stmt, stmt.name, function)
         return None
 
-    def visitIfStmt(self, stmt: If) -> None:
+    def visitIfStmt(self, stmt: If) -> Completion | None:
         condition = self.is_truthy(self.evaluate(stmt.condition))
         if condition:
-            self.execute(stmt.then_branch)
+            return self.execute(stmt.then_branch)
         elif stmt.else_branch:
-            self.execute(stmt.else_branch)
+            return self.execute(stmt.else_branch)
+        return None
 
-    def visitBreakStmt(self, stmt: Break) -> None:
-        raise BreakException
+    def visitBreakStmt(self, stmt: Break) -> Completion:
+        return BREAK
 
     def visitPrintStmt(self, stmt: Print) -> None:
         value = self.evaluate(stmt.expression)
-        print(self.stringify(value))
+        self.output.write_line(self.stringify(value))
         return None
 
-    def visitReturnStmt(self, stmt: Return) -> None:
+    def visitReturnStmt(self, stmt: Return) -> Completion:
+        # Tracers see calls through visitCallExpr, so tail calls are only made directly when not tracing
+        if stmt in self.tail_calls and self.tracer is None:
+            return self.tail_call_completion(stmt.value)
+
         value = None
 
         if stmt.value:
             value = self.evaluate(stmt.value)
-        
-        raise ReturnException(value)
+
+        self.return_value = value
+        return RETURN
+
+    def tail_call_completion(self, call: Call) -> Completion:
+        # Evaluates like visitCallExpr, but leaves a Lox function to be run by the current LoxFunction.call
+        callee = self.evaluate(call.callee)
+
+        if not isinstance(callee, LoxCallable):
+            raise LoxRuntimeError(call.paren, "Can only call functions or classes.")
+
+        args = [self.evaluate(arg) for arg in call.arguments]
+
+        if len(args) != callee.arity():
+            raise LoxRuntimeError(call.paren, f"Expected {callee.arity()} args but got {len(args)} args.")
+        if isinstance(callee, LoxFunction):
+            self.tail_call = (callee, args)
+            return TAIL_CALL
+
+        try:
+            self.return_value = callee.call(self, args)
+        except NativeError as error:
+            raise LoxRuntimeError(call.paren, error.message) from None
+        return RETURN
 
     def visitVarStmt(self, stmt: VarStmt) -> None:
         value = None
         if stmt.initializer != None:
             value = self.evaluate(stmt.initializer)
 
-        self.environment.define(stmt.name.LEXEME, value)
+        self.define(stmt, stmt.name, value)
         return None
 
-    def visitWhileStmt(self, stmt: While) -> None:
+    def visitWhileStmt(self, stmt: While) -> Completion | None:
         while self.is_truthy(self.evaluate(stmt.condition)):
             if not stmt.body:
                 print("DEBUG: no body found")
-                return
+                return None
 
-            try:
-                self.execute(stmt.body)
-            except BreakException:
+            completion = self.execute(stmt.body)
+            if completion is BREAK:
                 break
+            if completion is not None:
+                # A `return` inside the loop leaves the enclosing function
+                return completion
 
         return None
 
     def visitAssignExpr(self, expr: Assign):
         value = self.evaluate(expr.value)
-        self.environment.assign(expr.name, value)
+
+        local = self.locals.get(expr)
+        if local is not None:
+            self.environment.assign_at(local[0], local[1], value)
+        else:
+            self.globals.assign(expr.name, value)
         return value
 
     def visitLiteralExpr(self, expr: Literal) -> object:
@@ -197,7 +304,22 @@ class Interpreter(ExprVisitor, StmtVisitor):
 
     def visitUnaryExpr(self, expr: Unary) -> object:
         right = self.evaluate(expr.right)
+        if right.__class__ is float and expr.operator.TYPE == T.MINUS:
+            expr.cache_hits += 1
+            if expr.cache_hits >= QUICKEN_AFTER:
+                expr.__class__ = FloatNegate
+        return self.unary_operation(expr, right)
 
+    def visitFloatNegateExpr(self, expr: FloatNegate) -> object:
+        right = self.evaluate(expr.right)
+        if right.__class__ is float:
+            return -right
+        # Not a number after all: back to the generic node, which reports the error
+        expr.__class__ = Unary
+        expr.cache_hits = 0
+        return self.unary_operation(expr, right)
+
+    def unary_operation(self, expr: Unary, right: object) -> object:
         match expr.operator.TYPE:
             case T.BANG:
                 return not self.is_truthy(right)
@@ -209,12 +331,51 @@ class Interpreter(ExprVisitor, StmtVisitor):
         return None
 
     def visitVariableExpr(self, expr: VarExpr):
-        return self.environment.get(expr.name)
+        # Inline cache: the node remembers where its variable was found. A local's scope distance and slot never
+        # change; a global read is a single guarded dict load until a global is next defined.
+        version = expr.cache_version
+        if version == LOCAL:
+            if expr.cache_depth == 0:
+                return self.environment.slots[expr.cache_slot]
+            return self.environment.get_at(expr.cache_depth, expr.cache_slot)
+        if version == self.globals.version:
+            return self.globals.values[expr.name.LEXEME]
+
+        local = self.locals.get(expr)
+        if local is not None:
+            expr.cache_version = LOCAL
+            expr.cache_depth, expr.cache_slot = local
+            return self.environment.get_at(local[0], local[1])
+
+        value = self.globals.get(expr.name)
+        expr.cache_version = self.globals.version
+        return value
 
     def visitBinaryExpr(self, expr: Binary):
         left = self.evaluate(expr.left)
         right = self.evaluate(expr.right)
-
+        if left.__class__ is float and right.__class__ is float:
+            quickened = FLOAT_BINARY.get(expr.operator.TYPE)
+            if quickened is not None:
+                expr.cache_hits += 1
+                if expr.cache_hits >= QUICKEN_AFTER:
+                    expr.__class__ = quickened
+        return self.binary_operation(expr, left, right)
+
+    def visitFloatBinaryExpr(self, expr: FloatBinary):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if left.__class__ is float and right.__class__ is float:
+            try:
+                return expr.operation(left, right)
+            except ZeroDivisionError:
+                raise LoxRuntimeError(expr.operator, "Divide by zero") from None
+        # Operand types changed: back to the generic node, which handles strings and reports type errors
+        expr.__class__ = Binary
+        expr.cache_hits = 0
+        return self.binary_operation(expr, left, right)
+
+    def binary_operation(self, expr: Binary, left: object, right: object):
         match expr.operator.TYPE:
             case T.GREATER:
                 self.check_number_operands(expr.operator, left, right)
@@ -238,6 +399,8 @@ class Interpreter(ExprVisitor, StmtVisitor):
             case T.PLUS:
                 if isinstance(left, float) and isinstance(right, float):
                     return self._to_float(left) + self._to_float(right)
+                if left.__class__ is str and right.__class__ is str:
+                    return left + right
                 if isinstance(left, str) or isinstance(right, str):
                     # Stringify necessary so that `"string" + 1` isn't interpreted as `"string1.0"`
                     # although, there is an edgecase that if the user enters explicitly 1.0 then it will be presented as 1
@@ -261,6 +424,17 @@ class Interpreter(ExprVisitor, StmtVisitor):
         return None
     
     def visitCallExpr(self, call: Call):
+        # Inline cache: a call through a global name remembers the callee whose type and arity it checked, and
+        # skips the checks while the global still holds that callee
+        if call.cache_version == self.globals.version:
+            function = self.globals.values[call.callee.name.LEXEME]
+            if function is call.cache_callee:
+                args = [self.evaluate(arg) for arg in call.arguments]
+                try:
+                    return function.call(self, args)
+                except NativeError as error:
+                    raise LoxRuntimeError(call.paren, error.message) from None
+
         callee = self.evaluate(call.callee)
 
         if not isinstance(callee, LoxCallable):
@@ -271,6 +445,14 @@ class Interpreter(ExprVisitor, StmtVisitor):
         function = cast(LoxCallable, callee)
         if len(args) != function.arity():
             raise LoxRuntimeError(call.paren, f"Expected {function.arity()} args but got {len(args)} args.")
-        return function.call(self, args)
+
+        callee_expr = call.callee
+        if isinstance(callee_expr, VarExpr) and callee_expr.cache_version == self.globals.version:
+            call.cache_version = callee_expr.cache_version
+            call.cache_callee = function
+        try:
+            return function.call(self, args)
+        except NativeError as error:
+            raise LoxRuntimeError(call.paren, error.message) from None
 
 
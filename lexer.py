@@ -1,3 +1,5 @@
+import re
+import sys
 from tokenType import TokenType as T
 from tokens import Token
 from error_handler import error, report
@@ -24,6 +26,10 @@ class Lexer:
         "break": T.BREAK,
         "while": T.WHILE,
     }
+    # Identifier and keyword lexemes are interned, so repeated names share one string and
+    # Environment dict lookups hit the identity fast path.
+    global intern
+    intern = sys.intern
 
     def __init__(self, source: str):
         self.source = source  # Source code
@@ -96,11 +102,8 @@ class Lexer:
         while self.peek().isalnum():
             self.advance()
 
-        current_token = self.source[self.start:self.current]
-        if current_token in KEYWORDS:
-            self.add_token(KEYWORDS[current_token])
-        else:
-            self.add_token(T.IDENTIFIER)
+        current_token = intern(self.source[self.start:self.current])
+        self.TOKENS.append(Token(KEYWORDS.get(current_token, T.IDENTIFIER), current_token, None, self.line))
 
     def multi_comment(self):
         counter = 1
@@ -176,3 +179,229 @@ class Lexer:
                 else:
                     report(
                         self.line, f"{self.start}-{self.current}", f"Unexpected character {char}")
+
+
+class RegexLexer(Lexer):
+    """
+    Produces the same tokens, line numbers and error reports as `Lexer`, but scans with one compiled
+    alternation regex: every token, together with the blanks before it, is consumed by a single `match` call
+    instead of a method call per character.
+    Non-decimal numerals such as `½`, on which `Lexer` raises, are scanned as identifiers.
+    """
+    global MASTER_PATTERN, BLOCK_COMMENT_PATTERN, OPERATORS
+    global IDENTIFIER, OPERATOR, NEWLINES, NUMBER, STRING, LINE_COMMENT, BLOCK_COMMENT, CLOSE_COMMENT, UNEXPECTED, END
+    MASTER_PATTERN = re.compile(r"""
+        [ \t\r]*
+        (?:
+            (?P<IDENTIFIER>[^\W\d_][^\W_]*)
+          | (?P<OPERATOR>[!=<>]=?|[(){},.\-+;]|/(?![/*])|\*(?!/))
+          | (?P<NEWLINES>\n[ \t\r\n]*)
+          | (?P<NUMBER>\d+(?:\.\d+)?)
+          | (?P<STRING>"[^"]*"?)
+          | (?P<LINE_COMMENT>//[^\n]*)
+          | (?P<BLOCK_COMMENT>/\*)
+          | (?P<CLOSE_COMMENT>\*/)
+          | (?P<UNEXPECTED>.)
+          | (?P<END>)
+        )
+    """, re.VERBOSE | re.DOTALL)
+    # Group numbers, compared against `Match.lastindex` in the scanning loop
+    IDENTIFIER, OPERATOR, NEWLINES, NUMBER, STRING, LINE_COMMENT, BLOCK_COMMENT, CLOSE_COMMENT, UNEXPECTED, END = range(1, 11)
+    # Positions where a nested block comment can change state; see `Lexer.multi_comment`
+    BLOCK_COMMENT_PATTERN = re.compile(r"\n|/\*|\*/")
+    OPERATORS = {
+        "(": T.LEFT_PAREN, ")": T.RIGHT_PAREN, "{": T.LEFT_BRACE, "}": T.RIGHT_BRACE,
+        ",": T.COMMA, ".": T.DOT, "-": T.MINUS, "+": T.PLUS, ";": T.SEMICOLON,
+        "/": T.SLASH, "*": T.STAR, "!": T.BANG, "!=": T.BANG_EQUAL, "=": T.EQUAL,
+        "==": T.EQUAL_EQUAL, "<": T.LESS, "<=": T.LESS_EQUAL, ">": T.GREATER, ">=": T.GREATER_EQUAL,
+    }
+
+    def scan_tokens(self):
+        source = self.source
+        tokens = self.TOKENS
+        append = tokens.append
+        match = MASTER_PATTERN.match
+        keywords = KEYWORDS
+        operators = OPERATORS
+        end = len(source)
+        line = self.line
+        pos = 0
+
+        while pos < end:
+            m = match(source, pos)
+            kind = m.lastindex
+            text = m.group(kind)
+            pos = m.end()
+
+            if kind == IDENTIFIER:
+                text = intern(text)
+                append(Token(keywords.get(text, T.IDENTIFIER), text, None, line))
+            elif kind == OPERATOR:
+                append(Token(operators[text], text, None, line))
+            elif kind == NEWLINES:
+                line += text.count("\n")
+            elif kind == NUMBER:
+                append(Token(T.NUMBER, text, float(text), line))
+            elif kind == STRING:
+                line += text.count("\n")
+                if len(text) < 2 or text[-1] != '"':
+                    report(line, f"{m.start(kind)}-{pos}", "Unterminated string.")
+                else:
+                    append(Token(T.STRING, text, text[1:-1], line))
+            elif kind == LINE_COMMENT or kind == END:
+                pass
+            elif kind == BLOCK_COMMENT:
+                pos, line = self.block_comment(m.start(kind), line)
+            elif kind == CLOSE_COMMENT:
+                error(line=line, message="Unexpected close comment `*/`")
+            else:
+                report(line, f"{m.start(kind)}-{pos}", f"Unexpected character {text}")
+
+        self.current = pos
+        self.line = line
+        append(Token(T.EOF, "", None, line))
+        return tokens
+
+    def block_comment(self, start: int, line: int) -> tuple[int, int]:
+        """
+        Skip a (possibly nested) block comment opened at `start`, returning the position after it and the new line.
+        Like `Lexer.multi_comment`, the scan moves on one character after each match, so `*/*` both closes and reopens.
+        """
+        source = self.source
+        search = BLOCK_COMMENT_PATTERN.search
+        first_comment_line = line
+        counter = 1
+        pos = start + 2
+
+        while counter != 0:
+            m = search(source, pos)
+            if m is None:
+                report(first_comment_line, f"{start}-{len(source)}", "Unterminated multiline comment.")
+                return len(source), line
+
+            text = m.group()
+            if text == "\n":
+                line += 1
+            elif text == "/*":
+                counter += 1
+            else:
+                counter -= 1
+            pos = m.start() + 1
+
+        # consume final `/`
+        return pos + 1, line
+
+
+
+class StreamingLexer(RegexLexer):
+    """
+    Reads source text from a file object in chunks and yields tokens one at a time, so the whole script and
+    its token list are never held in memory at once. Only the unconsumed tail of the current chunk is kept.
+    Tokens, line numbers and error reports (with offsets into the whole file) are the same as `RegexLexer`.
+    """
+
+    def __init__(self, file, chunk_size: int = 1 << 16):
+        super().__init__("")
+        self.file = file
+        self.chunk_size = chunk_size
+        self.offset = 0  # position of `self.source[0]` in the whole file
+        self.at_eof = False
+
+    def refill(self) -> bool:
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.at_eof = True
+            return False
+        self.source += chunk
+        return True
+
+    def scan_tokens(self):
+        self.TOKENS = list(self.stream_tokens())
+        return self.TOKENS
+
+    def stream_tokens(self):
+        match = MASTER_PATTERN.match
+        keywords = KEYWORDS
+        operators = OPERATORS
+        line = self.line
+        pos = 0
+        self.refill()
+
+        while True:
+            source = self.source
+            end = len(source)
+            while pos < end:
+                m = match(source, pos)
+                # A match this close to the end of the chunk may continue (or be a different token) in the next one
+                if m.end() + 2 > end and not self.at_eof:
+                    break
+
+                kind = m.lastindex
+                text = m.group(kind)
+                pos = m.end()
+
+                if kind == IDENTIFIER:
+                    text = intern(text)
+                    yield Token(keywords.get(text, T.IDENTIFIER), text, None, line)
+                elif kind == OPERATOR:
+                    yield Token(operators[text], text, None, line)
+                elif kind == NEWLINES:
+                    line += text.count("\n")
+                elif kind == NUMBER:
+                    yield Token(T.NUMBER, text, float(text), line)
+                elif kind == STRING:
+                    line += text.count("\n")
+                    if len(text) < 2 or text[-1] != '"':
+                        report(line, f"{self.offset + m.start(kind)}-{self.offset + pos}", "Unterminated string.")
+                    else:
+                        yield Token(T.STRING, text, text[1:-1], line)
+                elif kind == LINE_COMMENT or kind == END:
+                    pass
+                elif kind == BLOCK_COMMENT:
+                    pos, line = self.block_comment(m.start(kind), line)
+                    source = self.source
+                    end = len(source)
+                elif kind == CLOSE_COMMENT:
+                    error(line=line, message="Unexpected close comment `*/`")
+                else:
+                    report(line, f"{self.offset + m.start(kind)}-{self.offset + pos}", f"Unexpected character {text}")
+
+            if self.at_eof and pos >= end:
+                break
+
+            # Drop the consumed text and read the next chunk
+            self.offset += pos
+            self.source = self.source[pos:]
+            pos = 0
+            self.refill()
+
+        self.line = line
+        yield Token(T.EOF, "", None, line)
+
+    def block_comment(self, start: int, line: int) -> tuple[int, int]:
+        # Same scan as `RegexLexer.block_comment`, reading more chunks until the comment is closed
+        first_comment_line = line
+        counter = 1
+        pos = start + 2
+
+        while counter != 0:
+            m = BLOCK_COMMENT_PATTERN.search(self.source, pos)
+            if m is None:
+                if self.refill():
+                    continue
+                report(first_comment_line, f"{self.offset + start}-{self.offset + len(self.source)}",
+                       "Unterminated multiline comment.")
+                return len(self.source), line
+
+            text = m.group()
+            if text == "\n":
+                line += 1
+            elif text == "/*":
+                counter += 1
+            else:
+                counter -= 1
+            pos = m.start() + 1
+
+        return pos + 1, line
+
+LEXERS = {"char": Lexer, "regex": RegexLexer}
@@ -1,73 +1,174 @@
 #!/usr/bin/env python3
 
 import sys
+import argparse
 import random
-from lexer import Lexer
-from error_handler import had_error, had_runtime_error
+from lexer import LEXERS, StreamingLexer
+import error_handler
 from parser import ParseError
 from prompts import PROMPT_LIST
 from expr import Expr
-from parser import Parser
+from parser import PARSERS
 from ast_printer import AST_printer
-from interpreter import Interpreter
-import logging
+from interpreter import Interpreter, ENGINES
+from vm import DEFAULT_STACK_LIMIT
+from resolver import Resolver
+from optimizer import Optimizer, OPTIMIZATION_LEVELS
+import ast_cache
+from tracing import TraceWriter
+from profiler import Profiler, SORT_KEYS
+from sampler import SamplingProfiler
+from repl import ReplSession
+from output import DEFAULT_BUFFER_SIZE, make_sink
 
-logging.basicConfig(level=logging.ERROR)
-
-
-def run(program, interpreter: Interpreter):
-    # Interpreter accepted as arg so that in REPL, the intepreter will be persistent, keeping variables set in REPL persistent.
-    # Indicate error in exit code
-    if had_error:
-        sys.exit(65)
-
-    if had_runtime_error:
-        sys.exit(70)
 
+def parse(tokens, parser_name="descent"):
     # tokens = program.split()
     # for token in tokens:
         # print(token)
     printer = AST_printer()
-    lex = Lexer(program)
-    tokens = lex.scan_tokens()
-
-    parser = Parser(tokens)
+    parser = PARSERS[parser_name](tokens)
     stmts = []
     try:
         stmts = parser.parse()
     except ParseError:
         print("Parsing error")
-    if stmts:
-        interpreter.interpret(stmts)
+    return stmts
 
 
-def runFile(path):
+def run_statements(stmts, interpreter: Interpreter, optimize: int = 1):
+    # Indicate errors in the exit code. The flags are read through the module, since error_handler rebinds them.
+    if error_handler.had_error:
+        sys.exit(65)
+
+    if not stmts:
+        return
+
+    # Static errors are found in the tree as written, so code the optimizer removes is still checked and the
+    # optimization level can't change which programs are valid
+    resolver = Resolver(interpreter)
+    resolver.resolve(stmts)
+    if resolver.had_error:
+        sys.exit(65)
+
+    # The optimized tree is resolved again, so the slots and frame sizes describe the tree that actually runs
+    optimized = Optimizer(interpreter, optimize).optimize(stmts)
+    if optimized is not stmts:
+        Resolver(interpreter).resolve(optimized)
+        stmts = optimized
+
+    interpreter.interpret(stmts)
+    if error_handler.had_runtime_error:
+        sys.exit(70)
+
+
+def runFile(path, engine="tree", lexer="char", stream=False, cache=True, optimize=1, tracer=None, parser="descent",
+            stack_limit=DEFAULT_STACK_LIMIT, buffer_size=DEFAULT_BUFFER_SIZE):
+    interpreter = Interpreter(engine, stack_limit, make_sink(buffer_size))
+    if tracer:
+        interpreter.set_tracer(tracer)
+    if cache:
+        digest = ast_cache.source_digest(path)
+        stmts = ast_cache.load(path, digest)
+        if stmts is not None:
+            run_statements(stmts, interpreter, optimize)
+            return
+
     with open(path, "r") as file:
-        program = file.read()
-        interpreter = Interpreter()
-        run(program, interpreter)
-
-
-def runPrompt():
-    while (True):
-        # prompt = PROMPT_LIST[random.randint(0, len(PROMPT_LIST)-1)]
-        prompt = '[plox]'
-        user_in = input(f"{prompt} -> ")
-        if not user_in and user_in != '':
-            break
-        interpreter = Interpreter()
-        # TODO: add a 'REPL' bool to interpreter that, if enabled, has extra logic to process raw expressions as well
-        run(user_in, interpreter)
-        had_error = False
-
-
-args = sys.argv
-n = len(args)
-if n > 2:
-    print("Usage: plox [script]")
-    sys.exit(64)
-elif n == 2:
-    print(f"Running file {args[1]}")
-    runFile(args[1])
+        if stream:
+            # Tokens are lexed from the file chunk by chunk as the parser asks for them
+            stmts = parse(StreamingLexer(file).stream_tokens(), parser)
+        else:
+            stmts = parse(LEXERS[lexer](file.read()).scan_tokens(), parser)
+
+    if cache and not error_handler.had_error:
+        # The unoptimized tree is cached, so one entry serves every optimization level
+        ast_cache.store(path, digest, stmts)
+    run_statements(stmts, interpreter, optimize)
+
+
+def precompile(root, lexer="char"):
+    cached, failed, removed = ast_cache.precompile(root, LEXERS[lexer])
+    print(f"Precompiled {cached} scripts under {root} ({failed} with errors, {removed} stale cache entries removed)")
+
+
+def runPrompt(engine="tree", lexer="char", optimize=1):
+    # One session, and so one interpreter, for the whole prompt, keeping variables and functions between entries
+    ReplSession(engine, lexer, optimize).run()
+
+
+arg_parser = argparse.ArgumentParser(prog="plox", usage="plox [--engine={tree,vm,closure}] [--lexer={char,regex}] [--stream] [--no-cache] [-O{0,1}] [--parser={descent,stack}] [--stack-limit=N] [--buffer-size=N] [--trace | --profile] [--sample] [script]\n"
+                                   "       plox --precompile <dir>")
+arg_parser.add_argument("script", nargs="?")
+arg_parser.add_argument("--engine", choices=ENGINES, default="tree",
+                        help="tree-walking interpreter (default), bytecode VM or closure compiler")
+arg_parser.add_argument("--lexer", choices=LEXERS, default="char",
+                        help="character-at-a-time scanner (default) or single-regex scanner")
+arg_parser.add_argument("--stream", action="store_true",
+                        help="lex the script from the file in chunks while parsing instead of reading it whole")
+arg_parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help=f"always lex and parse the script instead of using its {ast_cache.CACHE_DIR_NAME} entry")
+arg_parser.add_argument("-O", dest="optimize", type=int, choices=OPTIMIZATION_LEVELS, default=1,
+                        help="0 runs the parsed tree as is; 1 (default) folds constants and removes dead code first")
+arg_parser.add_argument("--parser", choices=PARSERS, default="descent",
+                        help="recursive-descent parser (default) or explicit-stack expression parser for very deeply "
+                             "nested expressions; run those with --engine=vm, whose compiler and calls don't recurse")
+arg_parser.add_argument("--stack-limit", metavar="N", type=int,
+                        help=f"maximum depth of nested Lox calls (vm engine only; default: {DEFAULT_STACK_LIMIT})")
+arg_parser.add_argument("--buffer-size", metavar="N", type=int,
+                        help=f"characters of script output collected before writing it (default: {DEFAULT_BUFFER_SIZE}, "
+                             f"or 0 with --trace); 0 writes each line as it is printed")
+arg_parser.add_argument("--trace", action="store_true",
+                        help="write node, scope and call events to stderr while running the script (tree engine only)")
+arg_parser.add_argument("--profile", action="store_true",
+                        help="report calls, self time and cumulative time per Lox function on stderr (tree engine only)")
+arg_parser.add_argument("--profile-json", metavar="FILE",
+                        help="write the --profile report to FILE as JSON instead")
+arg_parser.add_argument("--profile-sort", choices=SORT_KEYS, default="self",
+                        help="order of the --profile report (default: self time)")
+arg_parser.add_argument("--sample", action="store_true",
+                        help="sample the executing line periodically and report the hottest lines on stderr (tree engine only)")
+arg_parser.add_argument("--sample-interval", metavar="MS", type=float, default=1.0,
+                        help="milliseconds between samples (default: 1)")
+arg_parser.add_argument("--sample-collapsed", metavar="FILE",
+                        help="also write the sampled Lox call stacks to FILE in collapsed flamegraph format")
+arg_parser.add_argument("--precompile", metavar="DIR",
+                        help="parse and cache every .lox script under DIR, then remove stale cache entries")
+args = arg_parser.parse_args()
+profile = args.profile or args.profile_json
+if args.trace and profile:
+    arg_parser.error("--trace and --profile cannot be combined")
+sample = args.sample or args.sample_collapsed
+if args.buffer_size is not None and args.buffer_size < 0:
+    arg_parser.error("--buffer-size can't be negative")
+if args.stack_limit is not None and args.engine != "vm":
+    # The other engines are bounded by Python's recursion limit instead
+    arg_parser.error("--stack-limit requires --engine=vm")
+if (args.trace or profile or sample) and args.engine != "tree":
+    arg_parser.error(f"--{'trace' if args.trace else 'profile' if profile else 'sample'} requires --engine=tree")
+
+if args.precompile:
+    precompile(args.precompile, args.lexer)
+elif args.script:
+    print(f"Running file {args.script}")
+    tracer = TraceWriter() if args.trace else Profiler() if profile else None
+    sampler = SamplingProfiler(args.sample_interval / 1000) if sample else None
+    if sampler:
+        sampler.start()
+    # Trace events go to stderr as they happen, so the script's output is written as it happens too
+    buffer_size = args.buffer_size if args.buffer_size is not None else 0 if args.trace else DEFAULT_BUFFER_SIZE
+    try:
+        runFile(args.script, args.engine, args.lexer, args.stream, args.cache, args.optimize, tracer, args.parser,
+                args.stack_limit if args.stack_limit is not None else DEFAULT_STACK_LIMIT, buffer_size)
+    finally:
+        if sampler:
+            sampler.stop()
+            sampler.report()
+            if args.sample_collapsed:
+                sampler.write_collapsed(args.sample_collapsed)
+        if args.profile_json:
+            tracer.write_json(args.profile_json, args.profile_sort)
+        elif args.profile:
+            tracer.report(sort=args.profile_sort)
 else:
-    runPrompt()
+    runPrompt(args.engine, args.lexer, args.optimize)
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from stmt import Function
-from environment import Environment
-from error_handler import ReturnException
+from environment import Frame
+from completion import RETURN, TAIL_CALL
 
 class LoxCallable(ABC):
     @abstractmethod
@@ -10,6 +10,9 @@ class LoxCallable(ABC):
     @abstractmethod
     def call(self, interpreter, arguments: list[object]) -> object: pass
 
+    @abstractmethod
+    def to_string(self) -> str: pass
+
 class LoxFunction(LoxCallable):
     def __init__(self, declaration: Function):
         self.declaration = declaration
@@ -18,15 +21,20 @@ class LoxFunction(LoxCallable):
         return len(self.declaration.params)
 
     def call(self, interpreter, arguments: list[object]) -> None | object:
-        environment = Environment(interpreter.globals)
-        for i, param in enumerate(self.declaration.params):
-            environment.define(param.LEXEME, arguments[i])
+        function = self
+        # Each tail call made by the body replaces the running function here instead of nesting a Python call
+        while True:
+            # Parameters occupy the first slots of the call's Frame, followed by the body's locals
+            declaration = function.declaration
+            size = interpreter.frame_sizes[declaration]
+            environment = Frame(arguments + [None] * (size - len(arguments)), interpreter.globals)
 
-        try:
-            interpreter.execute_block(self.declaration.body, environment)
-        except ReturnException as return_val:
-            return return_val.value
-        return None
+            completion = interpreter.execute_block(declaration.body, environment)
+            if completion is RETURN:
+                return interpreter.return_value
+            if completion is not TAIL_CALL:
+                return None
+            function, arguments = interpreter.tail_call
     
     def to_string(self) -> str:
         return f"<function {self.declaration.name.LEXEME}>"
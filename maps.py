@@ -0,0 +1,90 @@
+"""
+Native hash maps. A `LoxMap` is backed by a Python dict, so `mapGet`/`mapPut`/`mapHas`/`mapDelete` take
+constant time instead of a chain of `if`s.
+
+    var ages = map();
+    mapPut(ages, "ada", 36);
+    print mapGet(ages, "ada");   // 36
+    print mapGet(ages, "bob");   // nil: use mapHas to tell a missing key from a nil value
+
+Keys are strings, numbers, booleans and nil, and two keys are the same when `==` says so (so `true` and `1` are
+one key, as `true == 1` is true). The exception is nil: `nil == nil` is false, but a nil key can still be found.
+`mapKeys` returns a new map from the indexes 0, 1, ... to the keys, in insertion order, since Lox has no list type.
+Maps are mutable and compared by identity, and none of the natives are pure as far as `memoize` is concerned.
+"""
+from __future__ import annotations
+from reprlib import recursive_repr
+from error_handler import NativeError
+from native import NativeFunction, format_value
+
+KEY_TYPES = (str, float, bool, type(None))
+
+
+class LoxMap:
+    __slots__ = ("entries",)
+
+    def __init__(self, entries: dict | None = None):
+        self.entries = {} if entries is None else entries
+
+    @recursive_repr("{...}")
+    def __str__(self) -> str:
+        return "{" + ", ".join(f"{format_value(key)}: {format_value(value)}"
+                               for key, value in self.entries.items()) + "}"
+
+
+def check_map(value: object) -> dict:
+    if not isinstance(value, LoxMap):
+        raise NativeError("Expected a map.")
+    return value.entries
+
+
+def check_key(key: object) -> object:
+    if not isinstance(key, KEY_TYPES):
+        raise NativeError("Map keys must be strings, numbers, booleans or nil.")
+    return key
+
+
+def new_map() -> LoxMap:
+    return LoxMap()
+
+
+def get(m: object, key: object) -> object:
+    return check_map(m).get(check_key(key))
+
+
+def put(m: object, key: object, value: object) -> object:
+    check_map(m)[check_key(key)] = value
+    return value
+
+
+def has(m: object, key: object) -> bool:
+    return check_key(key) in check_map(m)
+
+
+def delete(m: object, key: object) -> bool:
+    """Removes `key`, returning whether it was present."""
+    entries = check_map(m)
+    key = check_key(key)
+    if key not in entries:
+        return False
+    del entries[key]
+    return True
+
+
+def size(m: object) -> float:
+    return float(len(check_map(m)))
+
+
+def keys(m: object) -> LoxMap:
+    return LoxMap({float(index): key for index, key in enumerate(check_map(m))})
+
+
+NATIVES = (
+    NativeFunction("map", 0, new_map),
+    NativeFunction("mapGet", 2, get),
+    NativeFunction("mapPut", 3, put),
+    NativeFunction("mapHas", 2, has),
+    NativeFunction("mapDelete", 2, delete),
+    NativeFunction("mapSize", 1, size),
+    NativeFunction("mapKeys", 1, keys),
+)
@@ -0,0 +1,258 @@
+"""
+Opt-in memoization of Lox functions: `memoize(fn, capacity)` returns a callable that caches `fn`'s results for
+its `capacity` most recently used argument lists, and `memoStats(memoized)` describes its hit/miss/eviction counts.
+
+    fun fib(n) { if (n < 2) return n; return fib(n - 2) + fib(n - 1); }
+    fib = memoize(fib, 100);  // recursive calls now go through the cache as well
+
+Only functions whose result depends on nothing but their arguments can be memoized. `memoize` checks this
+statically (see `PurityChecker`) and refuses functions that print, read or assign global variables, call natives
+(which read the clock or mutable arrays, maps and builders), or call anything other than a function named by a
+global.
+
+The check is made against the functions the globals hold at the time, so each memoized function remembers them.
+If one of those globals is later given a different value, the next call empties the cache and checks the
+function again, failing with a runtime error if it is no longer pure.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from math import copysign
+from expr import Assign, Variable as VarExpr, Visitor as ExprVisitor, Expr, Literal, Unary, Binary, Grouping, Logical, Call
+from stmt import ExpressionStmt, Print, Var as VarStmt, Visitor as StmtVisitor, Stmt, Block, If, While, Break, Function, Return
+from tokens import Token
+from error_handler import NativeError
+from lox_callable import LoxCallable
+
+
+class MemoizedFunction(LoxCallable):
+    """Wraps a Lox function with a bounded LRU cache of its results, keyed on the argument values."""
+
+    def __init__(self, function: LoxCallable, capacity: int, dependencies: dict[str, object]):
+        self.function = function
+        self.capacity = capacity
+        # Global name -> the value it held when the function was checked
+        self.dependencies = dependencies
+        self.cache: OrderedDict[tuple, object] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def arity(self) -> int:
+        return self.function.arity()
+
+    def call(self, interpreter, arguments: list[object]) -> object:
+        if not self.dependencies_hold(interpreter.globals.values):
+            self.recheck(interpreter)
+
+        # Python considers `true == 1`, so each value is paired with its type to keep Lox's booleans and numbers apart,
+        # and a float with its sign since `-0.0 == 0.0` (as in `Chunk.add_constant`)
+        key = tuple([(float, argument, copysign(1.0, argument)) if argument.__class__ is float
+                     else (argument.__class__, argument) for argument in arguments])
+        cache = self.cache
+        if key in cache:
+            self.hits += 1
+            cache.move_to_end(key)
+            return cache[key]
+
+        self.misses += 1
+        value = self.function.call(interpreter, arguments)
+        cache[key] = value
+        if len(cache) > self.capacity:
+            cache.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def dependencies_hold(self, values: dict[str, object]) -> bool:
+        for name, value in self.dependencies.items():
+            current = values.get(name)
+            # `f = memoize(f, n)` replaces a function with its own memoized wrapper, which behaves the same
+            if current is not value and not (isinstance(current, MemoizedFunction) and current.function is value):
+                return False
+        return True
+
+    def recheck(self, interpreter) -> None:
+        checker = PurityChecker(interpreter)
+        reason = checker.check(self.function.declaration)
+        if reason is not None:
+            raise NativeError(f"Can't call {self.to_string()}: {reason}.")
+        self.dependencies = checker.dependencies
+        self.cache.clear()
+        self.invalidations += 1
+
+    def stats(self) -> str:
+        return (f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+                f"{self.invalidations} invalidations, {len(self.cache)}/{self.capacity} entries")
+
+    def to_string(self) -> str:
+        return f"<memoized {self.function.to_string()}>"
+
+
+class Memoize(LoxCallable):
+    """Native `memoize(fn, capacity)`."""
+    name = "memoize"
+
+    def arity(self) -> int:
+        return 2
+
+    def call(self, interpreter, arguments: list[object]) -> object:
+        function, capacity = arguments
+        if isinstance(function, MemoizedFunction):
+            return function
+        declaration = getattr(function, "declaration", None)
+        if not isinstance(declaration, Function):
+            raise NativeError("Can only memoize Lox functions.")
+        if not isinstance(capacity, float) or capacity < 1 or capacity != int(capacity):
+            raise NativeError("Memoize capacity must be a positive whole number.")
+
+        checker = PurityChecker(interpreter)
+        reason = checker.check(declaration)
+        if reason is not None:
+            raise NativeError(f"Can't memoize {function.to_string()}: {reason}.")
+        return MemoizedFunction(function, int(capacity), checker.dependencies)
+
+    def to_string(self) -> str:
+        return "<native fn>"
+
+
+class MemoStats(LoxCallable):
+    """Native `memoStats(memoized)`: a description of a memoized function's cache counters."""
+    name = "memoStats"
+
+    def arity(self) -> int:
+        return 1
+
+    def call(self, interpreter, arguments: list[object]) -> object:
+        function = arguments[0]
+        if not isinstance(function, MemoizedFunction):
+            raise NativeError("memoStats expects a memoized function.")
+        return function.stats()
+
+    def to_string(self) -> str:
+        return "<native fn>"
+
+
+class PurityChecker(ExprVisitor, StmtVisitor):
+    """
+    Decides whether a function's result depends only on its arguments, using the Resolver's side tables to tell
+    locals from globals. Functions called through global names are checked too, as found in the globals now;
+    `dependencies` records what each of those globals held.
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.pending: list[Function] = []
+        self.checked: set[Function] = set()
+        self.current: Function | None = None
+        self.reason: str | None = None
+        self.dependencies: dict[str, object] = {}
+
+    def check(self, function: Function) -> str | None:
+        """Why `function` cannot be memoized, or None if it can."""
+        self.pending.append(function)
+        while self.pending and self.reason is None:
+            self.current = self.pending.pop()
+            if self.current in self.checked:
+                continue
+            self.checked.add(self.current)
+            self.check_stmts(self.current.body)
+        return self.reason
+
+    def impure(self, reason: str) -> None:
+        if self.reason is None:
+            self.reason = f"{self.current.name.LEXEME} {reason}"
+
+    def check_stmts(self, statements: list[Stmt]) -> None:
+        for statement in statements:
+            if statement is not None:
+                statement.accept(self)
+
+    def check_expr(self, expr: Expr) -> None:
+        # Walked with an explicit stack like `Resolver.resolve_expr`; each visit returns the node's children
+        pending = [expr]
+        while pending:
+            pending.extend(pending.pop().accept(self))
+
+    def is_global(self, expr: Expr) -> bool:
+        return expr not in self.interpreter.locals
+
+    def check_global(self, name: Token) -> None:
+        value = self.interpreter.globals.values.get(name.LEXEME)
+        if isinstance(value, LoxCallable):
+            self.dependencies[name.LEXEME] = value
+        if isinstance(value, MemoizedFunction):
+            return
+        declaration = getattr(value, "declaration", None)
+        if isinstance(declaration, Function):
+            self.pending.append(declaration)
+        elif isinstance(value, LoxCallable):
+            self.impure(f"calls the native {name.LEXEME}")
+        else:
+            self.impure(f"reads the global variable {name.LEXEME}")
+
+    def visitBlockStmt(self, stmt: Block) -> None:
+        self.check_stmts(stmt.statements)
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt) -> None:
+        self.check_expr(stmt.expression)
+
+    def visitFunctionStmt(self, stmt: Function) -> None:
+        # A local function can only be called through a local variable, which `visitCallExpr` refuses
+        return None
+
+    def visitIfStmt(self, stmt: If) -> None:
+        self.check_expr(stmt.condition)
+        self.check_stmts([stmt.then_branch, stmt.else_branch])
+
+    def visitBreakStmt(self, stmt: Break) -> None:
+        return None
+
+    def visitPrintStmt(self, stmt: Print) -> None:
+        self.impure("calls print")
+
+    def visitReturnStmt(self, stmt: Return) -> None:
+        if stmt.value:
+            self.check_expr(stmt.value)
+
+    def visitVarStmt(self, stmt: VarStmt) -> None:
+        if stmt.initializer != None:
+            self.check_expr(stmt.initializer)
+
+    def visitWhileStmt(self, stmt: While) -> None:
+        self.check_expr(stmt.condition)
+        self.check_stmts([stmt.body])
+
+    def visitAssignExpr(self, expr: Assign) -> tuple[Expr, ...]:
+        if self.is_global(expr):
+            self.impure(f"assigns the global variable {expr.name.LEXEME}")
+        return (expr.value,)
+
+    def visitBinaryExpr(self, expr: Binary) -> tuple[Expr, ...]:
+        return (expr.left, expr.right)
+
+    def visitCallExpr(self, expr: Call) -> tuple[Expr, ...]:
+        # The function a parameter or local holds is only known at run time, so it can't be checked here
+        if not (isinstance(expr.callee, VarExpr) and self.is_global(expr.callee)):
+            self.impure(f"calls a function that is not named by a global (line {expr.paren.LINE})")
+        return (expr.callee, *expr.arguments)
+
+    def visitGroupingExpr(self, expr: Grouping) -> tuple[Expr, ...]:
+        return (expr.expression,)
+
+    def visitLiteralExpr(self, expr: Literal) -> tuple[Expr, ...]:
+        return ()
+
+    def visitLogicalExpr(self, expr: Logical) -> tuple[Expr, ...]:
+        return (expr.left, expr.right)
+
+    def visitUnaryExpr(self, expr: Unary) -> tuple[Expr, ...]:
+        return (expr.right,)
+
+    def visitVariableExpr(self, expr: VarExpr) -> tuple[Expr, ...]:
+        if self.is_global(expr):
+            self.check_global(expr.name)
+        return ()
+
+    # A function that has already run may contain quickened nodes (see quickening.py)
+    visitFloatBinaryExpr = visitBinaryExpr
+    visitFloatNegateExpr = visitUnaryExpr
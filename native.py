@@ -4,7 +4,32 @@
 import time
 from lox_callable import LoxCallable
 
+
+def format_number(value: float) -> str:
+    # Whole numbers are shown without the ".0" Python adds
+    text = str(value)
+    return text[:-2] if text.endswith(".0") else text
+
+
+def format_value(value: object) -> str:
+    """
+    How `print` shows `value`. `Interpreter.stringify` is this function; it lives here so native values such as
+    arrays and maps can show their contents from `__str__`, where there is no interpreter to ask.
+    """
+    if value is None:
+        return "nil"
+    if value is True or value is False:
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return format_number(value)
+    if isinstance(value, LoxCallable):
+        return value.to_string()
+    return str(value)
+
+
 class Clock(LoxCallable):
+    name = "clock"
+
     def __init__(self):
         pass
     
@@ -17,3 +42,21 @@ class Clock(LoxCallable):
     
     def to_string(self) -> str:
         return "<native fn>"
+
+
+class NativeFunction(LoxCallable):
+    """A native backed by a Python function that takes the Lox arguments positionally."""
+
+    def __init__(self, name: str, arity: int, function):
+        self.name = name
+        self._arity = arity
+        self.function = function
+
+    def arity(self) -> int:
+        return self._arity
+
+    def call(self, interpreter, arguments: list[object]) -> object:
+        return self.function(*arguments)
+
+    def to_string(self) -> str:
+        return "<native fn>"
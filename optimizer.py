@@ -0,0 +1,181 @@
+from __future__ import annotations
+from tokenType import TokenType as T
+from expr import Assign, Variable as VarExpr, Visitor as ExprVisitor, Expr, Literal, Unary, Binary, Grouping, Logical, Call
+from stmt import ExpressionStmt, Print, Var as VarStmt, Visitor as StmtVisitor, Stmt, Block, If, While, Break, Function, Return
+
+OPTIMIZATION_LEVELS = (0, 1)
+
+
+class Optimizer(ExprVisitor, StmtVisitor):
+    """
+    AST pass run after the Resolver has checked the parsed tree; the result is resolved again. At level 1 it folds constant arithmetic, comparisons,
+    string concatenation and logical operators, removes `Grouping` wrappers, and drops unreachable code:
+    `If` branches with a constant condition, `while (false)` loops, constant expression statements and
+    statements after a `return` or `break`. Level 0 leaves the tree untouched.
+
+    Operations that would fail at runtime (such as `1 / 0` or `-"a"`) are never folded, so the error is still
+    raised by the original node with its original line.
+    Visitors return the optimized node, or None for a statement that can be removed.
+    """
+
+    def __init__(self, interpreter, level: int = 1):
+        # The interpreter's helpers are used so folded values match what it would compute
+        self.interpreter = interpreter
+        self.level = level
+
+    def optimize(self, statements: list[Stmt]) -> list[Stmt]:
+        if self.level == 0:
+            return statements
+        try:
+            return self.optimize_stmts(statements)
+        except RecursionError:
+            # Expressions too deeply nested to optimize recursively (see `StackParser`) are run as parsed
+            return statements
+
+    def optimize_stmts(self, statements: list[Stmt]) -> list[Stmt]:
+        optimized = []
+        for statement in statements:
+            # Statements that failed to parse are None; keep them so the interpreter reports them as before
+            if statement is None:
+                optimized.append(statement)
+                continue
+
+            result = statement.accept(self)
+            if result is not None:
+                optimized.append(result)
+            if isinstance(result, (Return, Break)):
+                # Anything after this in the same list can never run
+                break
+        return optimized
+
+    def optimize_branch(self, stmt: Stmt) -> Stmt:
+        # Used where a statement is required, e.g. the body of an `if` or `while`
+        result = stmt.accept(self)
+        return result if result is not None else Block([])
+
+    def optimize_expr(self, expr: Expr) -> Expr:
+        return expr.accept(self)
+
+    def visitBlockStmt(self, stmt: Block) -> Stmt | None:
+        statements = self.optimize_stmts(stmt.statements)
+        if not statements:
+            return None
+        return Block(statements)
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt) -> Stmt | None:
+        expression = self.optimize_expr(stmt.expression)
+        if isinstance(expression, Literal):
+            return None
+        return ExpressionStmt(expression)
+
+    def visitFunctionStmt(self, stmt: Function) -> Stmt:
+        return Function(stmt.name, stmt.params, self.optimize_stmts(stmt.body))
+
+    def visitIfStmt(self, stmt: If) -> Stmt | None:
+        condition = self.optimize_expr(stmt.condition)
+        if isinstance(condition, Literal):
+            if self.interpreter.is_truthy(condition.value):
+                return stmt.then_branch.accept(self)
+            if stmt.else_branch:
+                return stmt.else_branch.accept(self)
+            return None
+
+        else_branch = self.optimize_branch(stmt.else_branch) if stmt.else_branch else None
+        return If(condition, self.optimize_branch(stmt.then_branch), else_branch)
+
+    def visitBreakStmt(self, stmt: Break) -> Stmt:
+        return stmt
+
+    def visitPrintStmt(self, stmt: Print) -> Stmt:
+        return Print(self.optimize_expr(stmt.expression))
+
+    def visitReturnStmt(self, stmt: Return) -> Stmt:
+        return Return(stmt.keyword, self.optimize_expr(stmt.value) if stmt.value else None)
+
+    def visitVarStmt(self, stmt: VarStmt) -> Stmt:
+        return VarStmt(stmt.name, self.optimize_expr(stmt.initializer) if stmt.initializer != None else None)
+
+    def visitWhileStmt(self, stmt: While) -> Stmt | None:
+        condition = self.optimize_expr(stmt.condition)
+        if isinstance(condition, Literal) and not self.interpreter.is_truthy(condition.value):
+            return None
+        return While(condition, self.optimize_branch(stmt.body) if stmt.body else None)
+
+    def visitAssignExpr(self, expr: Assign) -> Expr:
+        return Assign(expr.name, self.optimize_expr(expr.value))
+
+    def visitBinaryExpr(self, expr: Binary) -> Expr:
+        left = self.optimize_expr(expr.left)
+        right = self.optimize_expr(expr.right)
+        if isinstance(left, Literal) and isinstance(right, Literal):
+            folded = self.fold_binary(expr.operator.TYPE, left.value, right.value)
+            if folded is not None:
+                return folded
+        return Binary(left, expr.operator, right)
+
+    def fold_binary(self, operator: T, a: object, b: object) -> Literal | None:
+        interpreter = self.interpreter
+        match operator:
+            case T.EQUAL_EQUAL:
+                return Literal(interpreter.is_equal(a, b))
+            case T.BANG_EQUAL:
+                return Literal(not interpreter.is_equal(a, b))
+            case T.PLUS:
+                if isinstance(a, float) and isinstance(b, float):
+                    return Literal(a + b)
+                if isinstance(a, str) or isinstance(b, str):
+                    return Literal(interpreter.stringify(a) + interpreter.stringify(b))
+                return None
+
+        if not (isinstance(a, float) and isinstance(b, float)):
+            return None
+
+        match operator:
+            case T.MINUS:
+                return Literal(a - b)
+            case T.STAR:
+                return Literal(a * b)
+            case T.SLASH:
+                return Literal(a / b) if b != 0 else None
+            case T.GREATER:
+                return Literal(a > b)
+            case T.GREATER_EQUAL:
+                return Literal(a >= b)
+            case T.LESS:
+                return Literal(a < b)
+            case T.LESS_EQUAL:
+                return Literal(a <= b)
+        return None
+
+    def visitCallExpr(self, expr: Call) -> Expr:
+        return Call(self.optimize_expr(expr.callee), expr.paren,
+                    [self.optimize_expr(argument) for argument in expr.arguments])
+
+    def visitGroupingExpr(self, expr: Grouping) -> Expr:
+        return self.optimize_expr(expr.expression)
+
+    def visitLiteralExpr(self, expr: Literal) -> Expr:
+        return expr
+
+    def visitLogicalExpr(self, expr: Logical) -> Expr:
+        left = self.optimize_expr(expr.left)
+        right = self.optimize_expr(expr.right)
+        if isinstance(left, Literal):
+            truthy = self.interpreter.is_truthy(left.value)
+            # `or` yields a truthy left operand, `and` a falsey one; otherwise the result is the right operand
+            if truthy == (expr.operator.TYPE == T.OR):
+                return left
+            return right
+        return Logical(left, expr.operator, right)
+
+    def visitUnaryExpr(self, expr: Unary) -> Expr:
+        right = self.optimize_expr(expr.right)
+        if isinstance(right, Literal):
+            if expr.operator.TYPE == T.BANG:
+                return Literal(not self.interpreter.is_truthy(right.value))
+            if isinstance(right.value, float):
+                return Literal(-right.value)
+        return Unary(expr.operator, right)
+
+    def visitVariableExpr(self, expr: VarExpr) -> Expr:
+        return expr
@@ -0,0 +1,81 @@
+"""
+Output sinks for the `print` statement. Every engine writes printed lines to its interpreter's `output`, so a
+script's output can be buffered, or captured when Lox is embedded, without patching `sys.stdout`.
+
+`StdoutSink` writes each line as it is printed and suits interactive use. `BufferedSink` collects lines and
+writes them in batches of about `buffer_size` characters. `CaptureSink` keeps everything in memory. The
+interpreter flushes its sink at the end of every `interpret` call and before reporting a runtime error, so
+buffered output always comes before the error and is never lost.
+"""
+from __future__ import annotations
+import sys
+from abc import ABC, abstractmethod
+from typing import TextIO
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class OutputSink(ABC):
+    @abstractmethod
+    def write_line(self, text: str) -> None: pass
+
+    def flush(self) -> None:
+        pass
+
+
+class StdoutSink(OutputSink):
+    """Writes each printed line straight to `stream` (standard output by default)."""
+
+    def __init__(self, stream: TextIO | None = None):
+        # Without an explicit stream, sys.stdout is looked up on each write so redirecting it still works
+        self.stream = stream
+
+    def write_line(self, text: str) -> None:
+        print(text, file=self.stream or sys.stdout)
+
+    def flush(self) -> None:
+        (self.stream or sys.stdout).flush()
+
+
+class BufferedSink(OutputSink):
+    """Collects printed lines and writes them to `stream` once about `buffer_size` characters are waiting."""
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE, stream: TextIO | None = None):
+        self.buffer_size = buffer_size
+        self.stream = stream
+        self.lines: list[str] = []
+        self.size = 0
+
+    def write_line(self, text: str) -> None:
+        self.lines.append(text)
+        self.size += len(text) + 1
+        if self.size >= self.buffer_size:
+            self.write_buffer()
+
+    def write_buffer(self) -> None:
+        if self.lines:
+            (self.stream or sys.stdout).write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+            self.size = 0
+
+    def flush(self) -> None:
+        self.write_buffer()
+        (self.stream or sys.stdout).flush()
+
+
+class CaptureSink(OutputSink):
+    """Keeps printed lines in memory, for embedding the interpreter."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def write_line(self, text: str) -> None:
+        self.lines.append(text)
+
+    def getvalue(self) -> str:
+        return "".join(line + "\n" for line in self.lines)
+
+
+def make_sink(buffer_size: int) -> OutputSink:
+    """A BufferedSink of `buffer_size` characters, or a StdoutSink when `buffer_size` is 0."""
+    return BufferedSink(buffer_size) if buffer_size > 0 else StdoutSink()
@@ -1,9 +1,9 @@
-import logging
+from typing import Iterable
 from expr import Expr, Binary, Grouping, Literal, Unary, Variable as VarExpr, Assign, Logical, Call
 from stmt import Stmt, Print, ExpressionStmt, Var as VarStmt, Block, If, While, Break, Function, Return
 from tokens import Token
 from tokenType import TokenType as T
-from error_handler import error as lox_error, BreakException
+from error_handler import error as lox_error
 
 
 class ParseError(RuntimeError):
@@ -12,11 +12,12 @@ class ParseError(RuntimeError):
 
 
 class Parser:
-    def __init__(self, tokens: list):
-        logging.debug(f"Tokens: {[token.LEXEME for token in tokens]}")
-        logging.debug(f"Token Types: {[token.TYPE for token in tokens]}")
-        self.tokens = tokens
-        self.current = 0
+    def __init__(self, tokens: Iterable[Token]):
+        # Tokens are pulled lazily, so `tokens` can be a list or a generator such as `StreamingLexer.stream_tokens()`.
+        # The grammar needs one token of lookahead, so only the current and previous tokens are kept.
+        self.tokens = iter(tokens)
+        self.current_token: Token = next(self.tokens)
+        self.previous_token: Token = self.current_token
 
     def parse(self) -> list[Stmt]:
         statements = []
@@ -25,7 +26,7 @@ class Parser:
         return statements
 
     def peek(self) -> Token:
-        return self.tokens[self.current]
+        return self.current_token
 
     def is_at_end(self) -> bool:
         return self.peek().TYPE == T.EOF
@@ -34,11 +35,12 @@ class Parser:
         return False if self.is_at_end() else self.peek().TYPE == expected
 
     def previous(self) -> Token:
-        return self.tokens[self.current - 1]
+        return self.previous_token
 
     def advance(self):
         if not self.is_at_end():
-            self.current += 1
+            self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
         return self.previous()
 
     def match(self, *types: T):
@@ -121,11 +123,11 @@ class Parser:
         if not in_loop:
             raise self.error(
                 self.peek(), "Expected 'break' to be inside of a loop.")
-        self.consume(
+        keyword = self.consume(
             T.BREAK, "Unreachable; should have already checked for `break` with self.check()")
         self.consume(T.SEMICOLON, "Expected ';' after 'break'.")
 
-        return Break()
+        return Break(keyword)
 
     def for_statement(self) -> Stmt:
         self.consume(
@@ -385,3 +387,104 @@ class Parser:
             return Grouping(expr)
 
         raise (self.error(self.peek(), "Expect expression"))
+
+
+# Binding power of each infix operator in `StackParser`; `=` is the only right-associative one
+INFIX_PRECEDENCE = {
+    T.EQUAL: 0,
+    T.OR: 1,
+    T.AND: 2,
+    T.BANG_EQUAL: 3, T.EQUAL_EQUAL: 3,
+    T.GREATER: 4, T.GREATER_EQUAL: 4, T.LESS: 4, T.LESS_EQUAL: 4,
+    T.MINUS: 5, T.PLUS: 5,
+    T.SLASH: 6, T.STAR: 6,
+}
+
+# Entries on StackParser's operator stack
+UNARY, INFIX, GROUP, ARGUMENTS = range(4)
+
+
+class StackParser(Parser):
+    """
+    Parses expressions with explicit operand and operator stacks instead of recursive descent, so nesting
+    depth (parentheses, unary operators, call arguments, long operator chains) is not limited by Python's
+    recursion limit. It builds the same trees and reports the same errors as `Parser`; statements are still
+    parsed recursively.
+    """
+
+    def expression(self) -> Expr:
+        operands: list[Expr] = []
+        # (UNARY, operator) | (INFIX, precedence, operator) | (GROUP,) | (ARGUMENTS, callee, arguments)
+        operators: list[tuple] = []
+
+        while True:
+            # Prefix operators and an opening parenthesis wait on the stack for the operand that follows them
+            while self.match(T.BANG, T.MINUS):
+                operators.append((UNARY, self.previous()))
+            if self.match(T.LEFT_PAREN):
+                operators.append((GROUP,))
+                continue
+            operand = self.primary()
+
+            # The operand is complete: apply calls and prefix operators, then either continue with an infix
+            # operator or close the innermost group or argument list
+            while True:
+                while self.match(T.LEFT_PAREN):
+                    if self.check(T.RIGHT_PAREN):
+                        operand = Call(operand, self.advance(), [])
+                        continue
+                    operators.append((ARGUMENTS, operand, []))
+                    operand = None
+                    break
+                if operand is None:
+                    break
+
+                while operators and operators[-1][0] == UNARY:
+                    operand = Unary(operators.pop()[1], operand)
+
+                precedence = INFIX_PRECEDENCE.get(self.peek().TYPE)
+                if precedence is not None:
+                    operator = self.advance()
+                    # Combine pending operators that bind at least as tightly (only tighter ones for the
+                    # right-associative `=`) before this one takes the operand as its left side
+                    while operators and operators[-1][0] == INFIX and \
+                            (operators[-1][1] >= precedence if precedence else operators[-1][1] > precedence):
+                        operand = self.combine(operands.pop(), operators.pop(), operand)
+                    operands.append(operand)
+                    operators.append((INFIX, precedence, operator))
+                    break
+
+                while operators and operators[-1][0] == INFIX:
+                    operand = self.combine(operands.pop(), operators.pop(), operand)
+                if not operators:
+                    return operand
+
+                opener = operators.pop()
+                if opener[0] == GROUP:
+                    self.consume(T.RIGHT_PAREN, "Expect `)` after expression.")
+                    operand = Grouping(operand)
+                    continue
+
+                _, callee, args = opener
+                args.append(operand)
+                if self.match(T.COMMA):
+                    if len(args) >= 255:
+                        self.error(self.peek(), "Calls do not support more than 255 arguments.")
+                    operators.append(opener)
+                    break
+                paren = self.consume(T.RIGHT_PAREN, "Expected ')' after arguments")
+                operand = Call(callee, paren, args)
+
+    def combine(self, left: Expr, infix: tuple, right: Expr) -> Expr:
+        _, precedence, operator = infix
+        if precedence == 0:
+            if isinstance(left, VarExpr):
+                return Assign(left.name, right)
+            self.error(operator, "Invalid assignment target; expected variable expression.")
+            return left
+        if precedence <= 2:
+            return Logical(left, operator, right)
+        return Binary(left, operator, right)
+
+
+PARSERS = {"descent": Parser, "stack": StackParser}
@@ -0,0 +1,94 @@
+"""
+Per-function profiler for Lox programs, built on the call hooks in tracing.py.
+
+Each function is keyed by its declaration name and line (natives by their class name). For every key the
+profiler counts calls and accumulates self time (time spent in the function's own body) and cumulative time
+(including the functions it called). Only `visitCallExpr` is instrumented, so node evaluation runs at full speed.
+"""
+from __future__ import annotations
+import json
+import sys
+from time import perf_counter
+from typing import TextIO
+from expr import Call
+from lox_callable import LoxCallable
+from memoize import MemoizedFunction
+from tracing import Tracer
+
+SORT_KEYS = ("self", "cumulative", "calls")
+
+
+class FunctionStats:
+    __slots__ = ("name", "line", "calls", "self_time", "cumulative_time")
+
+    def __init__(self, name: str, line: int | None):
+        self.name = name
+        self.line = line
+        self.calls = 0
+        self.self_time = 0.0
+        self.cumulative_time = 0.0
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "line": self.line, "calls": self.calls,
+                "self_time": self.self_time, "cumulative_time": self.cumulative_time}
+
+
+def function_key(callee: LoxCallable) -> tuple[str, int | None]:
+    if isinstance(callee, MemoizedFunction):
+        # Calls through the memoized wrapper are reported as calls to the function it wraps
+        callee = callee.function
+    declaration = getattr(callee, "declaration", None)
+    if declaration is not None:
+        return declaration.name.LEXEME, declaration.name.LINE
+    return callee.name, None
+
+
+class Profiler(Tracer):
+
+    def __init__(self):
+        self.stats: dict[tuple[str, int | None], FunctionStats] = {}
+        # One [stats, start time, time spent in callees] entry per active call
+        self.stack: list[list] = []
+        # Active calls per function, so recursive calls only add to cumulative time once
+        self.active: dict[tuple[str, int | None], int] = {}
+
+    def call_enter(self, callee: LoxCallable, arguments: list[object], call: Call) -> None:
+        key = function_key(callee)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = FunctionStats(*key)
+        self.active[key] = self.active.get(key, 0) + 1
+        self.stack.append([stats, perf_counter(), 0.0])
+
+    def call_exit(self, callee: LoxCallable, value: object, call: Call) -> None:
+        now = perf_counter()
+        stats, start, in_callees = self.stack.pop()
+        elapsed = now - start
+
+        key = (stats.name, stats.line)
+        self.active[key] -= 1
+        stats.calls += 1
+        stats.self_time += elapsed - in_callees
+        if self.active[key] == 0:
+            stats.cumulative_time += elapsed
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def sorted_stats(self, sort: str = "self") -> list[FunctionStats]:
+        attribute = {"self": "self_time", "cumulative": "cumulative_time", "calls": "calls"}[sort]
+        return sorted(self.stats.values(), key=lambda stats: getattr(stats, attribute), reverse=True)
+
+    def report(self, stream: TextIO = sys.stderr, sort: str = "self", limit: int | None = None) -> None:
+        rows = self.sorted_stats(sort)[:limit]
+        stream.write(f"{'calls':>10} {'self (ms)':>12} {'cumulative (ms)':>16}  function\n")
+        for stats in rows:
+            location = f"line {stats.line}" if stats.line is not None else "native"
+            stream.write(f"{stats.calls:>10} {stats.self_time * 1000:>12.3f} {stats.cumulative_time * 1000:>16.3f}"
+                         f"  {stats.name} ({location})\n")
+
+    def to_json(self, sort: str = "self") -> str:
+        return json.dumps({"functions": [stats.to_dict() for stats in self.sorted_stats(sort)]}, indent=2)
+
+    def write_json(self, path: str, sort: str = "self") -> None:
+        with open(path, "w") as file:
+            file.write(self.to_json(sort))
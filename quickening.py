@@ -0,0 +1,88 @@
+"""
+Type-specialized ("quickened") forms of arithmetic, comparison and negation nodes for the tree-walking interpreter.
+
+A `Binary` or `Unary` node counts the times it has operated on numbers. Once it has done so `QUICKEN_AFTER`
+times, the interpreter swaps the node's class for the float-only form of its operator, which skips the
+generic path's operator dispatch and type checks. If a quickened node is ever given an operand that is not a
+number, it swaps itself back and redoes the operation on the generic path, so errors are reported exactly as
+before. The subclasses add no slots, so a node can change class in place; pickling (see `ast_cache`) always
+stores the generic class.
+
+Only the tree interpreter runs over quickened nodes: the other engines and passes finish with a tree before
+the interpreter starts.
+"""
+import operator
+from tokenType import TokenType as T
+from expr import Binary, Unary
+
+QUICKEN_AFTER = 8
+
+
+class FloatBinary(Binary):
+    """A `Binary` that has only seen numbers. `operation` is the Python operator applied to the two floats."""
+    __slots__ = ()
+    operation = None
+
+    def accept(self, visitor):
+        return visitor.visitFloatBinaryExpr(self)
+
+
+class FloatAdd(FloatBinary):
+    __slots__ = ()
+    operation = operator.add
+
+
+class FloatSubtract(FloatBinary):
+    __slots__ = ()
+    operation = operator.sub
+
+
+class FloatMultiply(FloatBinary):
+    __slots__ = ()
+    operation = operator.mul
+
+
+class FloatDivide(FloatBinary):
+    # Division by zero raises ZeroDivisionError, which `Interpreter.visitFloatBinaryExpr` reports like the generic path
+    __slots__ = ()
+    operation = operator.truediv
+
+
+class FloatGreater(FloatBinary):
+    __slots__ = ()
+    operation = operator.gt
+
+
+class FloatGreaterEqual(FloatBinary):
+    __slots__ = ()
+    operation = operator.ge
+
+
+class FloatLess(FloatBinary):
+    __slots__ = ()
+    operation = operator.lt
+
+
+class FloatLessEqual(FloatBinary):
+    __slots__ = ()
+    operation = operator.le
+
+
+class FloatNegate(Unary):
+    """A unary minus that has only seen numbers."""
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visitFloatNegateExpr(self)
+
+
+FLOAT_BINARY = {
+    T.PLUS: FloatAdd,
+    T.MINUS: FloatSubtract,
+    T.STAR: FloatMultiply,
+    T.SLASH: FloatDivide,
+    T.GREATER: FloatGreater,
+    T.GREATER_EQUAL: FloatGreaterEqual,
+    T.LESS: FloatLess,
+    T.LESS_EQUAL: FloatLessEqual,
+}
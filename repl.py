@@ -0,0 +1,131 @@
+"""
+Interactive session that keeps one `Interpreter` alive across entries, so globals and functions defined in
+earlier entries stay available and natives are only set up once.
+"""
+from __future__ import annotations
+import time
+import error_handler
+from tokenType import TokenType as T
+from tokens import Token
+from lexer import LEXERS
+from parser import Parser, ParseError
+from stmt import Stmt, Print
+from optimizer import Optimizer
+from resolver import Resolver
+from interpreter import Interpreter
+
+PROMPT = "[plox] -> "
+# Entries whose statements are kept for reuse, so re-running an entry (e.g. a benchmark call) skips the front end
+MAX_CACHED_ENTRIES = 256
+
+# Entries starting with one of these are statements even without a closing `;` or `}`, so a missing `;` is
+# reported as such rather than as a bad expression
+STATEMENT_KEYWORDS = (T.PRINT, T.VAR, T.FUN, T.CLASS, T.IF, T.WHILE, T.FOR, T.RETURN, T.BREAK, T.LEFT_BRACE)
+
+COMMANDS = {":time": "toggle printing how long each entry took",
+            ":help": "list the session commands",
+            ":quit": "end the session"}
+
+
+class ReplSession:
+
+    def __init__(self, engine: str = "tree", lexer: str = "char", optimize: int = 1):
+        self.interpreter = Interpreter(engine)
+        self.lexer = LEXERS[lexer]
+        self.optimize = optimize
+        self.timing = False
+        # source -> resolved statements; the resolver's results stay valid because the interpreter is reused
+        self.entries: dict[str, list[Stmt]] = {}
+
+    def run(self) -> None:
+        while True:
+            try:
+                source = input(PROMPT)
+            except EOFError:
+                print()
+                return
+            except KeyboardInterrupt:
+                print()
+                continue
+
+            source = source.strip()
+            if not source:
+                continue
+            if source.startswith(":"):
+                if not self.command(source):
+                    return
+                continue
+
+            start = time.perf_counter()
+            try:
+                self.execute(source)
+            except KeyboardInterrupt:
+                print("Interrupted")
+            if self.timing:
+                print(f"({(time.perf_counter() - start) * 1000:.3f} ms)")
+
+    def command(self, command: str) -> bool:
+        """Run a session command. Returns False when the session should end."""
+        if command == ":quit":
+            return False
+        if command == ":time":
+            self.timing = not self.timing
+            print(f"Timing {'on' if self.timing else 'off'}")
+        elif command == ":help":
+            for name, description in COMMANDS.items():
+                print(f"{name:8} {description}")
+        else:
+            print(f"Unknown command {command}; try :help")
+        return True
+
+    def execute(self, source: str) -> None:
+        error_handler.had_error = False
+        error_handler.had_runtime_error = False
+
+        statements = self.entries.get(source)
+        if statements is None:
+            statements = self.compile(source)
+            if statements is None:
+                return
+            if len(self.entries) >= MAX_CACHED_ENTRIES:
+                del self.entries[next(iter(self.entries))]
+            self.entries[source] = statements
+
+        self.interpreter.interpret(statements)
+
+    def compile(self, source: str) -> list[Stmt] | None:
+        tokens = self.lexer(source).scan_tokens()
+        if error_handler.had_error:
+            return None
+
+        statements = self.parse(tokens)
+        if statements is None or error_handler.had_error:
+            return None
+
+        # Checked as written and resolved again once optimized, as in `lox.run_statements`
+        resolver = Resolver(self.interpreter)
+        resolver.resolve(statements)
+        if resolver.had_error:
+            return None
+        optimized = Optimizer(self.interpreter, self.optimize).optimize(statements)
+        if optimized is not statements:
+            Resolver(self.interpreter).resolve(optimized)
+        return optimized
+
+    def parse(self, tokens: list[Token]) -> list[Stmt] | None:
+        # An entry that does not end like a statement is read as a bare expression and its value printed
+        if (len(tokens) > 1 and tokens[-2].TYPE not in (T.SEMICOLON, T.RIGHT_BRACE)
+                and tokens[0].TYPE not in STATEMENT_KEYWORDS):
+            parser = Parser(tokens)
+            try:
+                expression = parser.expression()
+                if not parser.is_at_end():
+                    raise parser.error(parser.peek(), "Expected end of expression.")
+            except ParseError:
+                return None
+            return [Print(expression)]
+
+        try:
+            return Parser(tokens).parse()
+        except ParseError:
+            return None
@@ -0,0 +1,186 @@
+from __future__ import annotations
+from enum import Enum
+from expr import Assign, Variable as VarExpr, Visitor as ExprVisitor, Expr, Literal, Unary, Binary, Grouping, Logical, Call
+from stmt import ExpressionStmt, Print, Var as VarStmt, Visitor as StmtVisitor, Stmt, Block, If, While, Break, Function, Return
+from tokens import Token
+from error_handler import error as lox_error
+
+
+class FunctionType(Enum):
+    NONE = 1
+    FUNCTION = 2
+
+
+class Resolver(ExprVisitor, StmtVisitor):
+    """
+    Static pass run between `Parser.parse()` and `Interpreter.interpret()`.
+    Every local variable reference is resolved to the number of scopes between it and its declaration plus
+    the slot it occupies in that scope's `Frame`, so the interpreter can index straight into the right frame.
+    References that are not found in any local scope are left unresolved and are treated as globals.
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.scopes: list[dict[str, int]] = []  # name -> slot index in the scope's Frame
+        self.current_function = FunctionType.NONE
+        self.loop_depth = 0  # Loops enclosing the current statement within the current function
+        self.had_error = False
+
+    def resolve(self, statements: list[Stmt]) -> None:
+        for statement in statements:
+            self.resolve_stmt(statement)
+
+    def resolve_stmt(self, stmt: Stmt | None) -> None:
+        # Parser.declaration() returns None for statements that failed to parse
+        if stmt is None:
+            return
+        stmt.accept(self)
+
+    def resolve_expr(self, expr: Expr) -> None:
+        # Expressions can nest far deeper than Python's recursion limit (e.g. generated `a + b + ...` chains), so
+        # they are walked with an explicit stack: each visit method resolves its own node and returns its children
+        pending = [expr]
+        while pending:
+            pending.extend(pending.pop().accept(self))
+
+    def error(self, token: Token, message: str) -> None:
+        lox_error(token=token, message=message)
+        self.had_error = True
+
+    def begin_scope(self) -> None:
+        self.scopes.append({})
+
+    def end_scope(self) -> None:
+        self.scopes.pop()
+
+    def declare(self, name: Token, stmt: Stmt | None = None) -> None:
+        if not self.scopes:
+            return
+
+        scope = self.scopes[-1]
+        if name.LEXEME in scope:
+            self.error(name, "Already a variable with this name in this scope.")
+            return
+        scope[name.LEXEME] = len(scope)
+        if stmt is not None:
+            self.interpreter.declare(stmt, scope[name.LEXEME])
+
+    def resolve_local(self, expr: Expr, name: Token) -> None:
+        for i in range(len(self.scopes) - 1, -1, -1):
+            if name.LEXEME in self.scopes[i]:
+                self.interpreter.resolve(expr, len(self.scopes) - 1 - i, self.scopes[i][name.LEXEME])
+                return
+        # Not found; assume it is global
+
+    def declares_variables(self, statements: list[Stmt]) -> bool:
+        # Declarations can only appear directly inside a block, so a block without any gets no scope or Frame
+        return any(isinstance(statement, (VarStmt, Function)) for statement in statements)
+
+    def resolve_function(self, function: Function, function_type: FunctionType) -> None:
+        # Functions do not capture their enclosing scope (see `LoxFunction.call`), so their bodies only see
+        # their own parameters and the globals.
+        enclosing_scopes = self.scopes
+        enclosing_function = self.current_function
+        enclosing_loop_depth = self.loop_depth
+        self.scopes = []
+        self.current_function = function_type
+        self.loop_depth = 0
+
+        # Parameters take the first slots so `LoxFunction.call` can place its arguments directly
+        self.begin_scope()
+        for param in function.params:
+            self.declare(param)
+        self.resolve(function.body)
+        self.interpreter.allocate(function, len(self.scopes[-1]))
+        self.end_scope()
+
+        self.scopes = enclosing_scopes
+        self.current_function = enclosing_function
+        self.loop_depth = enclosing_loop_depth
+
+    def visitBlockStmt(self, stmt: Block) -> None:
+        if not self.declares_variables(stmt.statements):
+            self.resolve(stmt.statements)
+            return None
+
+        self.begin_scope()
+        self.resolve(stmt.statements)
+        self.interpreter.allocate(stmt, len(self.scopes[-1]))
+        self.end_scope()
+        return None
+
+    def visitExpressionStmt(self, stmt: ExpressionStmt) -> None:
+        self.resolve_expr(stmt.expression)
+        return None
+
+    def visitFunctionStmt(self, stmt: Function) -> None:
+        self.declare(stmt.name, stmt)
+        self.resolve_function(stmt, FunctionType.FUNCTION)
+        return None
+
+    def visitIfStmt(self, stmt: If) -> None:
+        self.resolve_expr(stmt.condition)
+        self.resolve_stmt(stmt.then_branch)
+        self.resolve_stmt(stmt.else_branch)
+        return None
+
+    def visitBreakStmt(self, stmt: Break) -> None:
+        # The parser allows `break` in a function declared inside a loop; it cannot leave the caller's loop
+        if self.loop_depth == 0:
+            self.error(stmt.keyword, "Can't break outside of a loop.")
+        return None
+
+    def visitPrintStmt(self, stmt: Print) -> None:
+        self.resolve_expr(stmt.expression)
+        return None
+
+    def visitReturnStmt(self, stmt: Return) -> None:
+        if self.current_function == FunctionType.NONE:
+            self.error(stmt.keyword, "Can't return from top-level code.")
+
+        if stmt.value:
+            self.resolve_expr(stmt.value)
+            if isinstance(stmt.value, Call):
+                self.interpreter.mark_tail_call(stmt)
+        return None
+
+    def visitVarStmt(self, stmt: VarStmt) -> None:
+        # The initializer is resolved before the name is declared so that `var a = a + 1;` in a block
+        # reads the enclosing `a`, matching the interpreter's evaluation order.
+        if stmt.initializer != None:
+            self.resolve_expr(stmt.initializer)
+        self.declare(stmt.name, stmt)
+        return None
+
+    def visitWhileStmt(self, stmt: While) -> None:
+        self.resolve_expr(stmt.condition)
+        self.loop_depth += 1
+        self.resolve_stmt(stmt.body)
+        self.loop_depth -= 1
+        return None
+
+    def visitAssignExpr(self, expr: Assign) -> tuple[Expr, ...]:
+        self.resolve_local(expr, expr.name)
+        return (expr.value,)
+
+    def visitBinaryExpr(self, expr: Binary) -> tuple[Expr, ...]:
+        return (expr.left, expr.right)
+
+    def visitCallExpr(self, expr: Call) -> tuple[Expr, ...]:
+        return (expr.callee, *expr.arguments)
+
+    def visitGroupingExpr(self, expr: Grouping) -> tuple[Expr, ...]:
+        return (expr.expression,)
+
+    def visitLiteralExpr(self, expr: Literal) -> tuple[Expr, ...]:
+        return ()
+
+    def visitLogicalExpr(self, expr: Logical) -> tuple[Expr, ...]:
+        return (expr.left, expr.right)
+
+    def visitUnaryExpr(self, expr: Unary) -> tuple[Expr, ...]:
+        return (expr.right,)
+
+    def visitVariableExpr(self, expr: VarExpr) -> tuple[Expr, ...]:
+        self.resolve_local(expr, expr.name)
+        return ()
@@ -0,0 +1,116 @@
+"""
+Sampling profiler for the tree-walking interpreter.
+
+A background thread wakes up every `interval` seconds and inspects the interpreter thread's Python stack
+(`sys._current_frames()`). Frames of the `Interpreter.visit*` methods hold the `Stmt`/`Expr` being executed,
+and frames of `LoxFunction.call` hold the Lox function, so each sample yields the current source line and the
+Lox call stack. Nothing is added to the interpreter itself, and the cost per sample depends only on the
+stack depth, not on the size of the program.
+"""
+from __future__ import annotations
+import sys
+import threading
+from collections import Counter
+from typing import TextIO
+from interpreter import Interpreter
+from lox_callable import LoxFunction
+from tracing import node_line
+
+# Parameter holding the node in each Interpreter.visit* method
+NODE_PARAMETERS = ("stmt", "expr", "call")
+
+VISIT_CODES = frozenset(getattr(Interpreter, name).__code__ for name in dir(Interpreter) if name.startswith("visit"))
+CALL_CODE = LoxFunction.call.__code__
+
+SCRIPT_FRAME = "<script>"
+
+
+class SamplingProfiler:
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.lines: Counter[int] = Counter()
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.dropped = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._target: int | None = None
+        self._switch_interval: float | None = None
+
+    def start(self, thread_id: int | None = None) -> None:
+        """Start sampling the thread `thread_id` (by default the calling thread)."""
+        self._target = thread_id if thread_id is not None else threading.get_ident()
+        self._stop.clear()
+        # The sampler needs the GIL to take a sample; let the interpreter thread give it up at least as often
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread = threading.Thread(target=self._run, name="lox-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            sys.setswitchinterval(self._switch_interval)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            try:
+                self.sample(frame)
+            except Exception:
+                # The target thread keeps running while its stack is walked, so a sample can catch a frame
+                # half set up; losing that one sample is better than losing the thread and every later one
+                self.dropped += 1
+
+    def sample(self, frame) -> None:
+        """Record the Lox line and call stack for the Python stack ending at `frame`."""
+        line = None
+        functions = []
+        while frame is not None:
+            code = frame.f_code
+            if code in VISIT_CODES:
+                if line is None:
+                    # The innermost node may have no token of its own (e.g. a Literal); outer nodes are tried next
+                    local_vars = frame.f_locals
+                    for parameter in NODE_PARAMETERS:
+                        if parameter in local_vars:
+                            line = node_line(local_vars[parameter])
+                            break
+            elif code is CALL_CODE:
+                # `function` rather than `self`: tail calls replace the running function within one call frame.
+                # A sample taken before `function` is first assigned finds only `self`.
+                local_vars = frame.f_locals
+                function = local_vars.get("function") or local_vars.get("self")
+                if function is not None:
+                    name = function.declaration.name
+                    functions.append(f"{name.LEXEME} (line {name.LINE})")
+            frame = frame.f_back
+
+        if line is None:
+            # Not executing Lox code, e.g. still lexing and parsing
+            return
+        self.samples += 1
+        self.lines[line] += 1
+        functions.append(SCRIPT_FRAME)
+        functions.reverse()
+        functions.append(f"line {line}")
+        self.stacks[";".join(functions)] += 1
+
+    def report(self, stream: TextIO = sys.stderr, limit: int | None = 20) -> None:
+        stream.write(f"{self.samples} samples every {self.interval * 1000:g} ms\n")
+        if self.dropped:
+            stream.write(f"{self.dropped} samples dropped\n")
+        stream.write(f"{'line':>8} {'samples':>10} {'%':>7}\n")
+        for line, count in self.lines.most_common(limit):
+            stream.write(f"{line:>8} {count:>10} {count * 100 / self.samples:>7.1f}\n")
+
+    def write_collapsed(self, path: str) -> None:
+        """Write the stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        with open(path, "w") as file:
+            for stack, count in sorted(self.stacks.items()):
+                file.write(f"{stack} {count}\n")
@@ -1,3 +1,4 @@
+# Generated by Tools/generate_ast.py; edit the type list there instead of this file.
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from tokens import Token
@@ -5,6 +6,8 @@ from expr import Expr
 
 
 class Stmt(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor: Visitor): pass
 
@@ -13,27 +16,40 @@ class Stmt(ABC):
 
 
 class Block(Stmt):
+    __slots__ = ("statements",)
+
     def __init__(self, statements: list[Stmt]):
         self.statements = statements
 
     def accept(self, visitor: Visitor):
         return visitor.visitBlockStmt(self)
 
+    def __reduce__(self):
+        return (Block, (self.statements,))
+
     def to_string(self) -> str:
-        return f"Block({[statement.to_string() for statement in self.statements]})"
+        return f"Block([{', '.join(item.to_string() for item in self.statements)}])"
 
 
 class ExpressionStmt(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
     def accept(self, visitor: Visitor):
         return visitor.visitExpressionStmt(self)
 
+    def __reduce__(self):
+        return (ExpressionStmt, (self.expression,))
+
     def to_string(self) -> str:
         return f"ExprStmt({self.expression.to_string()})"
 
+
 class Function(Stmt):
+    __slots__ = ("name", "params", "body")
+
     def __init__(self, name: Token, params: list[Token], body: list[Stmt]):
         self.name = name
         self.params = params
@@ -42,11 +58,16 @@ class Function(Stmt):
     def accept(self, visitor: Visitor):
         return visitor.visitFunctionStmt(self)
 
-    def to_string(self):
-        return f"<function>" 
+    def __reduce__(self):
+        return (Function, (self.name, self.params, self.body))
+
+    def to_string(self) -> str:
+        return f"Function({self.name.to_string()}, [{', '.join(item.to_string() for item in self.params)}], [{', '.join(item.to_string() for item in self.body)}])"
 
 
 class If(Stmt):
+    __slots__ = ("condition", "then_branch", "else_branch")
+
     def __init__(self, condition: Expr, then_branch: Stmt, else_branch: Stmt | None):
         self.condition = condition
         self.then_branch = then_branch
@@ -55,32 +76,49 @@ class If(Stmt):
     def accept(self, visitor: Visitor):
         return visitor.visitIfStmt(self)
 
+    def __reduce__(self):
+        return (If, (self.condition, self.then_branch, self.else_branch))
+
     def to_string(self) -> str:
         return f"If({self.condition.to_string()}, {self.then_branch.to_string()}, {None if not self.else_branch else self.else_branch.to_string()})"
 
 
 class Print(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
     def accept(self, visitor: Visitor):
         return visitor.visitPrintStmt(self)
 
+    def __reduce__(self):
+        return (Print, (self.expression,))
+
     def to_string(self) -> str:
         return f"Print({self.expression.to_string()})"
 
+
 class Return(Stmt):
+    __slots__ = ("keyword", "value")
+
     def __init__(self, keyword: Token, value: Expr | None):
         self.keyword = keyword
         self.value = value
 
     def accept(self, visitor: Visitor):
         return visitor.visitReturnStmt(self)
-    
+
+    def __reduce__(self):
+        return (Return, (self.keyword, self.value))
+
     def to_string(self) -> str:
-        return f"Return()"
+        return f"Return({self.keyword.to_string()}, {None if not self.value else self.value.to_string()})"
+
 
 class Var(Stmt):
+    __slots__ = ("name", "initializer")
+
     def __init__(self, name: Token, initializer: Expr | None):
         self.name = name
         self.initializer = initializer
@@ -88,11 +126,16 @@ class Var(Stmt):
     def accept(self, visitor: Visitor):
         return visitor.visitVarStmt(self)
 
+    def __reduce__(self):
+        return (Var, (self.name, self.initializer))
+
     def to_string(self) -> str:
         return f"VarDec({self.name.to_string()}, {None if not self.initializer else self.initializer.to_string()})"
 
 
 class While(Stmt):
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition: Expr, body: Stmt | None):
         self.condition = condition
         self.body = body
@@ -100,42 +143,53 @@ class While(Stmt):
     def accept(self, visitor: Visitor):
         return visitor.visitWhileStmt(self)
 
+    def __reduce__(self):
+        return (While, (self.condition, self.body))
+
     def to_string(self) -> str:
         return f"While({self.condition.to_string()}, {None if not self.body else self.body.to_string()})"
 
 
 class Break(Stmt):
+    __slots__ = ("keyword",)
+
+    def __init__(self, keyword: Token):
+        self.keyword = keyword
+
     def accept(self, visitor: Visitor):
         return visitor.visitBreakStmt(self)
 
+    def __reduce__(self):
+        return (Break, (self.keyword,))
+
     def to_string(self) -> str:
-        return f"Break()"
+        return f"Break({self.keyword.to_string()})"
 
 
 class Visitor:
     @abstractmethod
-    def visitExpressionStmt(self, stmt: ExpressionStmt): pass
+    def visitBlockStmt(self, stmt: Block): pass
 
     @abstractmethod
-    def visitPrintStmt(self, stmt: Print): pass
+    def visitExpressionStmt(self, stmt: ExpressionStmt): pass
 
     @abstractmethod
-    def visitVarStmt(self, stmt: Var): pass
+    def visitFunctionStmt(self, stmt: Function): pass
 
     @abstractmethod
-    def visitBlockStmt(self, stmt: Block): pass
+    def visitIfStmt(self, stmt: If): pass
 
     @abstractmethod
-    def visitIfStmt(self, stmt: If): pass
+    def visitPrintStmt(self, stmt: Print): pass
 
     @abstractmethod
-    def visitWhileStmt(self, stmt: While): pass
+    def visitReturnStmt(self, stmt: Return): pass
 
     @abstractmethod
-    def visitBreakStmt(self, stmt: Break): pass
+    def visitVarStmt(self, stmt: Var): pass
 
     @abstractmethod
-    def visitFunctionStmt(self, stmt: Function): pass
+    def visitWhileStmt(self, stmt: While): pass
 
     @abstractmethod
-    def visitReturnStmt(self, stmt: Return): pass
\ No newline at end of file
+    def visitBreakStmt(self, stmt: Break): pass
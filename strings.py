@@ -0,0 +1,66 @@
+"""
+Native string builders. Appending to a builder adds the text to a list of parts, so building a string of n
+characters takes O(n) time overall, where repeated `s = s + part` copies the whole string on every append.
+The parts are joined when the builder is turned into a string: by `builderString`, `print`, or `+` with a string.
+
+    var out = builder();
+    for (var i = 0; i < 3; i = i + 1) builderAppend(out, i);
+    builderAppend(out, " done");
+    print out;                 // 012 done
+
+Values other than strings are appended as `print` would show them. Builders are mutable, and none of the
+natives are pure as far as `memoize` is concerned.
+"""
+from __future__ import annotations
+from error_handler import NativeError
+from native import NativeFunction, format_value
+
+
+class LoxStringBuilder:
+    __slots__ = ("parts", "length")
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self.length = 0
+
+    def append(self, text: str) -> None:
+        self.parts.append(text)
+        self.length += len(text)
+
+    def __str__(self) -> str:
+        # Keep the joined string as the only part, so converting again without appending costs nothing
+        if len(self.parts) != 1:
+            self.parts = ["".join(self.parts)]
+        return self.parts[0] if self.parts else ""
+
+
+def check_builder(value: object) -> LoxStringBuilder:
+    if not isinstance(value, LoxStringBuilder):
+        raise NativeError("Expected a string builder.")
+    return value
+
+
+def new_builder() -> LoxStringBuilder:
+    return LoxStringBuilder()
+
+
+def append(b: object, value: object) -> LoxStringBuilder:
+    builder = check_builder(b)
+    builder.append(value if isinstance(value, str) else format_value(value))
+    return builder
+
+
+def length(b: object) -> float:
+    return float(check_builder(b).length)
+
+
+def to_string(b: object) -> str:
+    return str(check_builder(b))
+
+
+NATIVES = (
+    NativeFunction("builder", 0, new_builder),
+    NativeFunction("builderAppend", 2, append),
+    NativeFunction("builderLength", 1, length),
+    NativeFunction("builderString", 1, to_string),
+)
@@ -2,11 +2,18 @@ from tokenType import TokenType
 
 
 class Token:
+    # No per-instance __dict__; large scripts produce hundreds of thousands of tokens
+    __slots__ = ("TYPE", "LEXEME", "LITERAL", "LINE")
+
     def __init__(self, _type: TokenType, lexeme: str, literal: object, line: int):
         self.TYPE = _type
         self.LEXEME = lexeme
         self.LITERAL = literal
         self.LINE = line
 
+    def __reduce__(self):
+        # Pickled as a constructor call (see ast_cache.py), which loads much faster than per-slot state
+        return (Token, (self.TYPE, self.LEXEME, self.LITERAL, self.LINE))
+
     def to_string(self):
         return (f"<{self.TYPE.name}, `{self.LEXEME}`, {self.LITERAL}>")
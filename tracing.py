@@ -0,0 +1,209 @@
+"""
+Instrumentation hooks for the tree-walking interpreter.
+
+A `Tracer` receives node entry/exit, scope push/pop and call entry/exit events. `Interpreter.set_tracer`
+installs traced versions of its dispatch methods on the instance, so an interpreter without a tracer runs
+the plain class methods and pays nothing for the hooks.
+"""
+from __future__ import annotations
+import sys
+from typing import TextIO
+from expr import Expr, Call
+from stmt import Stmt
+from tokens import Token
+from environment import Environment, Frame
+from error_handler import LoxRuntimeError, NativeError
+from lox_callable import LoxCallable
+from completion import Completion
+
+# Interpreter methods replaced on the instance while a tracer is installed
+TRACED_METHODS = ("evaluate", "execute", "execute_block", "visitCallExpr")
+
+# Fields holding a node's identifying token, and the child nodes to search when a node has none
+TOKEN_FIELDS = ("name", "operator", "paren", "keyword")
+CHILD_FIELDS = ("left", "callee", "expression", "condition", "value", "initializer", "right")
+
+
+def node_line(node: Expr | Stmt | None) -> int | None:
+    """Source line of `node`, taken from its own token or its first child that has one."""
+    token = node_token(node)
+    return token.LINE if token is not None else None
+
+
+def node_token(node: Expr | Stmt | None) -> Token | None:
+    """The token identifying `node`, or that of its first child that has one."""
+    while node is not None:
+        for field in TOKEN_FIELDS:
+            token = getattr(node, field, None)
+            if token is not None:
+                return token
+        for field in CHILD_FIELDS:
+            child = getattr(node, field, None)
+            if child is not None:
+                node = child
+                break
+        else:
+            statements = getattr(node, "statements", None)
+            node = next((statement for statement in statements if statement is not None), None) if statements else None
+    return None
+
+
+class Tracer:
+    """Base tracer; every hook is a no-op, so subclasses only override the events they need."""
+
+    def node_enter(self, node: Expr | Stmt) -> None:
+        pass
+
+    def node_exit(self, node: Expr | Stmt, value: object) -> None:
+        # `value` is the expression's result; None for statements and when the node raised
+        pass
+
+    def scope_push(self, environment: Environment | Frame) -> None:
+        pass
+
+    def scope_pop(self, environment: Environment | Frame) -> None:
+        pass
+
+    def call_enter(self, callee: LoxCallable, arguments: list[object], call: Call) -> None:
+        pass
+
+    def call_exit(self, callee: LoxCallable, value: object, call: Call) -> None:
+        pass
+
+
+class TraceEvent:
+    __slots__ = ("kind", "subject", "value", "depth")
+
+    def __init__(self, kind: str, subject: object, value: object, depth: int):
+        self.kind = kind
+        self.subject = subject
+        self.value = value
+        self.depth = depth
+
+    def to_string(self) -> str:
+        subject = self.subject
+        if isinstance(subject, (Expr, Stmt)):
+            line = node_line(subject)
+            subject = f"{type(subject).__name__} line {line}" if line is not None else type(subject).__name__
+        elif isinstance(subject, LoxCallable):
+            subject = subject.to_string()
+        elif isinstance(subject, Frame):
+            subject = f"Frame({len(subject.slots)} slots)"
+        return f"{'  ' * self.depth}{self.kind} {subject}"
+
+
+class EventRecorder(Tracer):
+    """Records every event as a `TraceEvent`, with `depth` counting the enter/push events still open."""
+
+    def __init__(self):
+        self.events: list[TraceEvent] = []
+        self.depth = 0
+
+    def record(self, kind: str, subject: object, value: object = None) -> None:
+        self.events.append(TraceEvent(kind, subject, value, self.depth))
+
+    def node_enter(self, node: Expr | Stmt) -> None:
+        self.record("enter", node)
+        self.depth += 1
+
+    def node_exit(self, node: Expr | Stmt, value: object) -> None:
+        self.depth -= 1
+        self.record("exit", node, value)
+
+    def scope_push(self, environment: Environment | Frame) -> None:
+        self.record("scope_push", environment)
+        self.depth += 1
+
+    def scope_pop(self, environment: Environment | Frame) -> None:
+        self.depth -= 1
+        self.record("scope_pop", environment)
+
+    def call_enter(self, callee: LoxCallable, arguments: list[object], call: Call) -> None:
+        self.record("call", callee, arguments)
+        self.depth += 1
+
+    def call_exit(self, callee: LoxCallable, value: object, call: Call) -> None:
+        self.depth -= 1
+        self.record("return", callee, value)
+
+
+class TraceWriter(EventRecorder):
+    """Writes each event to `stream` as it happens instead of keeping it."""
+
+    def __init__(self, stream: TextIO = sys.stderr):
+        super().__init__()
+        self.stream = stream
+
+    def record(self, kind: str, subject: object, value: object = None) -> None:
+        self.stream.write(TraceEvent(kind, subject, value, self.depth).to_string() + "\n")
+
+
+def overrides(tracer: Tracer, *hooks: str) -> bool:
+    return any(getattr(type(tracer), hook) is not getattr(Tracer, hook) for hook in hooks)
+
+
+def install(interpreter, tracer: Tracer) -> None:
+    """
+    Shadow the interpreter's dispatch methods with versions that report to `tracer`.
+    Only the methods whose hooks the tracer overrides are replaced, so e.g. a tracer that only watches calls
+    leaves node evaluation untouched.
+    """
+    node_enter = tracer.node_enter
+    node_exit = tracer.node_exit
+    execute_block = type(interpreter).execute_block
+
+    def evaluate(expr: Expr) -> object:
+        node_enter(expr)
+        value = None
+        try:
+            value = expr.accept(interpreter)
+            return value
+        finally:
+            node_exit(expr, value)
+
+    def execute(stmt: Stmt) -> Completion | None:
+        node_enter(stmt)
+        try:
+            return stmt.accept(interpreter)
+        finally:
+            node_exit(stmt, None)
+
+    def traced_execute_block(statements: list[Stmt], environment: Environment | Frame) -> Completion | None:
+        tracer.scope_push(environment)
+        try:
+            return execute_block(interpreter, statements, environment)
+        finally:
+            tracer.scope_pop(environment)
+
+    def visitCallExpr(call: Call) -> object:
+        # Mirrors Interpreter.visitCallExpr, with the call hooks around the call itself
+        callee = interpreter.evaluate(call.callee)
+        if not isinstance(callee, LoxCallable):
+            raise LoxRuntimeError(call.paren, "Can only call functions or classes.")
+
+        args = [interpreter.evaluate(arg) for arg in call.arguments]
+        if len(args) != callee.arity():
+            raise LoxRuntimeError(call.paren, f"Expected {callee.arity()} args but got {len(args)} args.")
+
+        tracer.call_enter(callee, args, call)
+        value = None
+        try:
+            value = callee.call(interpreter, args)
+            return value
+        except NativeError as error:
+            raise LoxRuntimeError(call.paren, error.message) from None
+        finally:
+            tracer.call_exit(callee, value, call)
+
+    if overrides(tracer, "node_enter", "node_exit"):
+        interpreter.evaluate = evaluate
+        interpreter.execute = execute
+    if overrides(tracer, "scope_push", "scope_pop"):
+        interpreter.execute_block = traced_execute_block
+    if overrides(tracer, "call_enter", "call_exit"):
+        interpreter.visitCallExpr = visitCallExpr
+
+
+def uninstall(interpreter) -> None:
+    for method in TRACED_METHODS:
+        interpreter.__dict__.pop(method, None)
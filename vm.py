@@ -0,0 +1,292 @@
+from __future__ import annotations
+from bytecode import FunctionProto, CONSTANT, POP, GET_LOCAL_0, SET_LOCAL_0, GET_LOCAL, SET_LOCAL, DEFINE_LOCAL, \
+    GET_GLOBAL, SET_GLOBAL, DEFINE_GLOBAL, ADD, SUBTRACT, MULTIPLY, DIVIDE, GREATER, GREATER_EQUAL, LESS, LESS_EQUAL, \
+    EQUAL, NOT_EQUAL, NOT, NEGATE, JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE_OR_POP, JUMP_IF_FALSE_OR_POP, PUSH_SCOPE, \
+    POP_SCOPE, CALL, RETURN, FUNCTION, PRINT, TAIL_CALL
+from environment import Environment, Frame
+from error_handler import LoxRuntimeError, NativeError
+from lox_callable import LoxCallable
+
+
+class VMFunction(LoxCallable):
+    """A Lox function compiled for the VM. Like `LoxFunction`, its body only sees its parameters and the globals."""
+
+    def __init__(self, proto: FunctionProto, vm: VM):
+        self.proto = proto
+        self.declaration = proto.declaration
+        self.vm = vm
+
+    def arity(self) -> int:
+        return self.proto.arity
+
+    def call(self, interpreter, arguments: list[object]) -> object:
+        # Only reached when a native calls back into Lox; calls made from bytecode are handled inline by the VM
+        return self.vm.run(self.proto, self.vm.new_frame(self.proto, arguments))
+
+    def to_string(self) -> str:
+        return f"<function {self.proto.name}>"
+
+
+# Default maximum number of nested Lox calls
+DEFAULT_STACK_LIMIT = 100000
+
+
+class VM:
+    """
+    Stack-based virtual machine for the bytecode produced by `Compiler`.
+    Lox calls push a call frame onto an explicit list instead of recursing in Python, and every instruction
+    is dispatched from a single loop, so recursion depth is bounded by `stack_limit` rather than by Python's
+    recursion limit. Exceeding it raises a LoxRuntimeError at the call.
+    """
+
+    def __init__(self, interpreter, stack_limit: int = DEFAULT_STACK_LIMIT):
+        self.interpreter = interpreter
+        self.stack_limit = stack_limit
+
+    def interpret(self, script: FunctionProto) -> None:
+        self.run(script, self.interpreter.globals)
+
+    def new_frame(self, proto: FunctionProto, arguments: list[object]) -> Frame:
+        return Frame(arguments + [None] * (proto.frame_size - len(arguments)), self.interpreter.globals)
+
+    def run(self, proto: FunctionProto, env: Environment | Frame) -> object:
+        interpreter = self.interpreter
+        stack_limit = self.stack_limit
+        stringify = interpreter.stringify
+        write_line = interpreter.output.write_line
+        global_env = interpreter.globals
+        global_values = global_env.values
+
+        stack: list[object] = []
+        push = stack.append
+        pop = stack.pop
+        calls: list[tuple[list[int], list[object], int, Environment | Frame]] = []
+
+        code = proto.chunk.code
+        constants = proto.chunk.constants
+        ip = 0
+
+        while True:
+            instruction = code[ip]
+
+            if instruction == GET_LOCAL_0:
+                push(env.slots[code[ip + 1]])
+                ip += 2
+
+            elif instruction == CONSTANT:
+                push(constants[code[ip + 1]])
+                ip += 2
+
+            elif instruction == GET_GLOBAL:
+                name = constants[code[ip + 1]]
+                try:
+                    push(global_values[name.LEXEME])
+                except KeyError:
+                    raise LoxRuntimeError(name, f'Undefined variable {name.LEXEME}.')
+                ip += 2
+
+            elif instruction == JUMP_IF_FALSE:
+                condition = pop()
+                if condition is None or condition is False:
+                    ip = code[ip + 1]
+                else:
+                    ip += 2
+
+            elif instruction == SET_LOCAL_0:
+                env.slots[code[ip + 1]] = stack[-1]
+                ip += 2
+
+            elif instruction == ADD:
+                right = pop()
+                left = pop()
+                if isinstance(left, float) and isinstance(right, float):
+                    push(left + right)
+                elif left.__class__ is str and right.__class__ is str:
+                    push(left + right)
+                elif isinstance(left, str) or isinstance(right, str):
+                    push(stringify(left) + stringify(right))
+                else:
+                    raise LoxRuntimeError(constants[code[ip + 1]], "Expect operands to be two numbers or two strings")
+                ip += 2
+
+            elif instruction == LESS or instruction == LESS_EQUAL or instruction == GREATER \
+                    or instruction == GREATER_EQUAL or instruction == SUBTRACT or instruction == MULTIPLY \
+                    or instruction == DIVIDE:
+                right = pop()
+                left = pop()
+                if not (isinstance(left, float) and isinstance(right, float)):
+                    raise LoxRuntimeError(constants[code[ip + 1]], "Expected numerical operands")
+                if instruction == LESS:
+                    push(left < right)
+                elif instruction == LESS_EQUAL:
+                    push(left <= right)
+                elif instruction == GREATER:
+                    push(left > right)
+                elif instruction == GREATER_EQUAL:
+                    push(left >= right)
+                elif instruction == SUBTRACT:
+                    push(left - right)
+                elif instruction == MULTIPLY:
+                    push(left * right)
+                else:
+                    if right == 0:
+                        raise LoxRuntimeError(constants[code[ip + 1]], "Divide by zero")
+                    push(left / right)
+                ip += 2
+
+            elif instruction == POP:
+                pop()
+                ip += 1
+
+            elif instruction == JUMP:
+                ip = code[ip + 1]
+
+            elif instruction == CALL:
+                argc = code[ip + 1]
+                base = len(stack) - argc
+                callee = stack[base - 1]
+                if not isinstance(callee, LoxCallable):
+                    raise LoxRuntimeError(constants[code[ip + 2]], "Can only call functions or classes.")
+                arguments = stack[base:]
+                del stack[base - 1:]
+                if argc != callee.arity():
+                    raise LoxRuntimeError(constants[code[ip + 2]],
+                                          f"Expected {callee.arity()} args but got {argc} args.")
+
+                if isinstance(callee, VMFunction) and callee.vm is self:
+                    if len(calls) >= stack_limit:
+                        raise LoxRuntimeError(constants[code[ip + 2]], "Stack overflow.")
+                    calls.append((code, constants, ip + 3, env))
+                    callee_proto = callee.proto
+                    env = Frame(arguments + [None] * (callee_proto.frame_size - argc), global_env)
+                    code = callee_proto.chunk.code
+                    constants = callee_proto.chunk.constants
+                    ip = 0
+                else:
+                    try:
+                        push(callee.call(interpreter, arguments))
+                    except NativeError as error:
+                        raise LoxRuntimeError(constants[code[ip + 2]], error.message) from None
+                    ip += 3
+
+            elif instruction == RETURN:
+                if not calls:
+                    return pop()
+                code, constants, ip, env = calls.pop()
+
+            elif instruction == TAIL_CALL:
+                argc = code[ip + 1]
+                base = len(stack) - argc
+                callee = stack[base - 1]
+                if not isinstance(callee, LoxCallable):
+                    raise LoxRuntimeError(constants[code[ip + 2]], "Can only call functions or classes.")
+                arguments = stack[base:]
+                del stack[base - 1:]
+                if argc != callee.arity():
+                    raise LoxRuntimeError(constants[code[ip + 2]],
+                                          f"Expected {callee.arity()} args but got {argc} args.")
+
+                if isinstance(callee, VMFunction) and callee.vm is self:
+                    # The callee takes over the current call frame; its RETURN goes straight to our caller
+                    callee_proto = callee.proto
+                    env = Frame(arguments + [None] * (callee_proto.frame_size - argc), global_env)
+                    code = callee_proto.chunk.code
+                    constants = callee_proto.chunk.constants
+                    ip = 0
+                else:
+                    try:
+                        value = callee.call(interpreter, arguments)
+                    except NativeError as error:
+                        raise LoxRuntimeError(constants[code[ip + 2]], error.message) from None
+                    if not calls:
+                        return value
+                    push(value)
+                    code, constants, ip, env = calls.pop()
+
+            elif instruction == GET_LOCAL:
+                frame = env
+                for _ in range(code[ip + 1]):
+                    frame = frame.enclosing
+                push(frame.slots[code[ip + 2]])
+                ip += 3
+
+            elif instruction == SET_LOCAL:
+                frame = env
+                for _ in range(code[ip + 1]):
+                    frame = frame.enclosing
+                frame.slots[code[ip + 2]] = stack[-1]
+                ip += 3
+
+            elif instruction == EQUAL:
+                right = pop()
+                left = pop()
+                push(interpreter.is_equal(left, right))
+                ip += 1
+
+            elif instruction == NOT_EQUAL:
+                right = pop()
+                left = pop()
+                push(not interpreter.is_equal(left, right))
+                ip += 1
+
+            elif instruction == JUMP_IF_TRUE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    pop()
+                    ip += 2
+                else:
+                    ip = code[ip + 1]
+
+            elif instruction == JUMP_IF_FALSE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    ip = code[ip + 1]
+                else:
+                    pop()
+                    ip += 2
+
+            elif instruction == NOT:
+                value = pop()
+                push(value is None or value is False)
+                ip += 1
+
+            elif instruction == NEGATE:
+                value = pop()
+                if not isinstance(value, float):
+                    raise LoxRuntimeError(constants[code[ip + 1]], "Expected numerical operand")
+                push(-value)
+                ip += 2
+
+            elif instruction == PUSH_SCOPE:
+                env = Frame([None] * code[ip + 1], env)
+                ip += 2
+
+            elif instruction == POP_SCOPE:
+                env = env.enclosing
+                ip += 1
+
+            elif instruction == DEFINE_LOCAL:
+                env.slots[code[ip + 1]] = pop()
+                ip += 2
+
+            elif instruction == SET_GLOBAL:
+                name = constants[code[ip + 1]]
+                if name.LEXEME not in global_values:
+                    raise LoxRuntimeError(name, f"Undefined variable {name.LEXEME}.")
+                global_values[name.LEXEME] = stack[-1]
+                ip += 2
+
+            elif instruction == DEFINE_GLOBAL:
+                global_env.define(constants[code[ip + 1]].LEXEME, pop())
+                ip += 2
+
+            elif instruction == FUNCTION:
+                push(VMFunction(constants[code[ip + 1]], self))
+                ip += 2
+
+            elif instruction == PRINT:
+                write_line(stringify(pop()))
+                ip += 1
+
+            else:
+                raise RuntimeError(f"Unknown opcode {instruction} at offset {ip}")